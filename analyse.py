@@ -1,7 +1,27 @@
 """ Log files analyzer for queen algorihm performance. """
 import os
 import re
+import csv
 import json
+import math
+import sys
+import statistics
+
+from validate import KNOWN_SOLUTIONS, check_count
+
+# columns of the compact store (results/results.csv)
+STORE_COLUMNS = ['chessboard-width', 'language', 'version', 'source', 'timestamp', 'duration']
+# defaults of the regression check (can be changed with "regression" in analyse.json)
+REGRESSION = {
+    # minimum number of earlier runs for a baseline
+    'min-runs': 3,
+    # slowdown relative to the baseline median to be relevant
+    'threshold': 0.1,
+    # slowdown in median absolute deviations to be significant
+    'deviations': 3.0
+}
+# number of largest widths used to fit the growth of the duration
+FIT_WIDTHS = 4
 
 
 def get_value_for_key(text_buffer, key):
@@ -11,6 +31,67 @@ def get_value_for_key(text_buffer, key):
     return ""
 
 
+def get_statistics(text_buffer):
+    """Parsing repeated-run statistics (wall and cpu time) of one run if available."""
+    expression = r"\.\.\.(?P<name>wall|cpu) time: runs=(?P<runs>\d+)"
+    expression += r", min=(?P<min>\d*\.\d*), median=(?P<median>\d*\.\d*)"
+    expression += r", mean=(?P<mean>\d*\.\d*), stddev=(?P<stddev>\d*\.\d*)"
+    expression += r", p95=(?P<p95>\d*\.\d*) seconds."
+
+    statistics = {}
+    for match in re.finditer(expression, text_buffer):
+        values = {key: float(match.group(key))
+                  for key in ['min', 'median', 'mean', 'stddev', 'p95']}
+        values['runs'] = int(match.group('runs'))
+        statistics[match.group('name')] = values
+    return statistics
+
+
+def get_profile(text_buffer):
+    """Parsing the profile (JSON) of one run if available."""
+    for match in re.finditer(r"\.\.\.profile=(?P<profile>\{.*\})", text_buffer):
+        return json.loads(match.group('profile'))
+    return None
+
+
+def get_latency(text_buffer):
+    """
+    Parsing the total process time and the startup and import time of the
+    runtime (measured by the runners) of one run if available.
+    """
+    expression = r"\.\.\.(?P<name>process|startup|imports) took (?P<value>\d*\.\d*) seconds."
+    return {match.group('name'): float(match.group('value'))
+            for match in re.finditer(expression, text_buffer)}
+
+
+def get_pool(text_buffer):
+    """Parsing how the tasks were run (processes, threads or remote) if available."""
+    for match in re.finditer(r"\.\.\.pool=(?P<pool>\w+)", text_buffer):
+        return match.group('pool')
+    return None
+
+
+def get_variant(text_buffer):
+    """
+    Parsing the N-queens variant (rows, blocked squares, ...) or the limits
+    of the search (--first, --first-row) of one run if available.
+    """
+    for match in re.finditer(r"\.\.\.(variant|limited)=(?P<variant>.*)", text_buffer):
+        return match.group('variant')
+    return None
+
+
+def check_solutions(width, solutions, text_buffer):
+    """
+    Whether the number of solutions of one run is correct; a constructed
+    solution (--construct) is correct when reported valid. None when unknown.
+    """
+    match = re.search(r"\.\.\.solution (?P<result>valid|INVALID) ", text_buffer)
+    if match:
+        return solutions == 1 and match.group('result') == "valid"
+    return check_count(width, solutions)
+
+
 def process_buffer(text_buffer, language, distribution, url):
     """ parse log files for queen algorithm performance details. """
     data = []
@@ -25,13 +106,15 @@ def process_buffer(text_buffer, language, distribution, url):
 
     if len(timestamp) == 0:
         timestamp = "0"
+    pool = get_pool(text_buffer)
 
     expression = r"Queen raster \((?P<n1>\d*)x(?P<n2>\d*)\)"
     expression += r"\n...took (?P<duration>\d*\.\d*) seconds."
     expression += r"\n...(?P<solutions>\d*) solutions found."
 
-    for match in re.finditer(expression, text_buffer):
-        data.append({
+    matches = list(re.finditer(expression, text_buffer))
+    for index, match in enumerate(matches):
+        entry = {
             'language': language,
             'url': url,
             'distribution': distribution,
@@ -40,9 +123,43 @@ def process_buffer(text_buffer, language, distribution, url):
             'solutions': int(match.group('solutions')),
             'source': source,
             'version': version
-        })
+        }
+
+        if pool:
+            entry['pool'] = {str(timestamp): pool}
+
+        # statistics are printed after the result when running repeatedly
+        end = matches[index + 1].start() if index + 1 < len(matches) else len(text_buffer)
+        statistics = get_statistics(text_buffer[match.end():end])
+        if statistics:
+            entry['statistics'] = {str(timestamp): statistics}
+
+        profile = get_profile(text_buffer[match.end():end])
+        if profile:
+            entry['profile'] = {str(timestamp): profile}
+
+        latency = get_latency(text_buffer[match.end():end])
+        if latency:
+            latency['solve'] = entry['durations'][str(timestamp)]
+            entry['latency'] = {str(timestamp): latency}
+
+        # variants and limited searches are measurements of their own
+        # without known number of solutions
+        variant = get_variant(text_buffer[match.end():end])
+        if variant:
+            entry['source'] = "%s (%s)" % (source, variant)
+        elif check_solutions(entry['chessboard-width'], entry['solutions'],
+                             text_buffer[match.end():end]) is False:
+            print("...wrong number of solutions for width {0}: {1} (expected {2})"
+                  .format(entry['chessboard-width'], entry['solutions'],
+                          KNOWN_SOLUTIONS.get(entry['chessboard-width'], "a valid one")))
+            entry['wrong-solutions'] = {str(timestamp): entry['solutions']}
+
+        data.append(entry)
 
-    assert len(data) > 0
+    if not data:
+        # the first width did time out or fail (see scripts/async_runner.py)
+        print("...no measurements found")
     return data
 
 
@@ -53,28 +170,170 @@ def process_descriptor(text_buffer, descriptor):
                           descriptor['distribution'],
                           descriptor['url'])
 
-def find_data(all_data, entry):
-    for data in all_data:
-        if data["chessboard-width"] != entry["chessboard-width"]:
-            continue
-        if data["language"] != entry["language"]:
-            continue
-        if data["version"] != entry["version"]:
-            continue
-        if data["source"] != entry["source"]:
-            continue
-        return data
-    return None
+def get_key(entry):
+    """Key identifying the data of one chessboard width, language, version and source."""
+    return (entry["chessboard-width"], entry["language"], entry["version"], entry["source"])
+
+
+def create_index(all_data):
+    """Dictionary of all data by key."""
+    return {get_key(data): data for data in all_data}
 
 
-def update_data(old_data, new_data):
+def update_data(old_data, new_data, index=None):
     """Updating existing or adding new data."""
+    if index is None:
+        index = create_index(old_data)
+
     for new in new_data:
-        old = find_data(old_data, new)
+        old = index.get(get_key(new))
         if old:
             old['durations'].update(new['durations'])
+            for key in ['statistics', 'profile', 'wrong-solutions', 'pool', 'latency']:
+                if key in new:
+                    old.setdefault(key, {}).update(new[key])
         else:
             old_data.append(new)
+            index[get_key(new)] = new
+
+
+def find_descriptor(entry, descriptors):
+    """First descriptor whose key is part of the log file name or None."""
+    for descriptor in descriptors:
+        if entry.find(descriptor['key']) >= 0:
+            return descriptor
+    return None
+
+
+def get_signature(path):
+    """Modification time and size of a file to detect changes."""
+    stat = os.stat(path)
+    return [stat.st_mtime_ns, stat.st_size]
+
+
+def get_rows(all_data):
+    """Rows for the compact store; one per measurement."""
+    for data in all_data:
+        for timestamp, duration in sorted(data['durations'].items()):
+            yield [data['chessboard-width'], data['language'], data['version'],
+                   data['source'], timestamp, duration]
+
+
+def write_store(path, all_data, append):
+    """Appending rows to the compact store or writing it from scratch."""
+    exists = os.path.isfile(path)
+    with open(path, "a" if append and exists else "w", newline="") as handle:
+        writer = csv.writer(handle)
+        if not (append and exists):
+            writer.writerow(STORE_COLUMNS)
+        writer.writerows(get_rows(all_data))
+
+
+def write_summary(path, all_data):
+    """
+    Writing average, minimum and maximum duration per language, version,
+    source and chessboard width (columns and rows) for the table and the
+    charts of the report; runs with a wrong number of solutions are left out.
+    """
+    rows = []
+    for data in sorted(all_data, key=lambda data: (get_key(data)[1:], get_key(data)[0])):
+        wrong = data.get('wrong-solutions', {})
+        durations = [duration for timestamp, duration in data['durations'].items()
+                     if timestamp not in wrong]
+        if not durations:
+            continue
+        rows.append([data['language'], data['version'], data['source'], data['url'],
+                     data['chessboard-width'], data['solutions'], len(durations),
+                     sum(durations) / len(durations), min(durations), max(durations)])
+
+    with open(path, "w") as handle:
+        handle.write(json.dumps({
+            'columns': ['language', 'version', 'source', 'url', 'chessboard-width',
+                        'solutions', 'runs', 'average', 'min', 'max'],
+            'rows': rows
+        }))
+
+
+def get_baseline(durations):
+    """Median and median absolute deviation (scaled like a standard deviation)."""
+    median = statistics.median(durations)
+    deviation = statistics.median([abs(duration - median) for duration in durations])
+    return median, 1.4826 * deviation
+
+
+def check_regression(data, options):
+    """
+    Latest run of one width, language, version and source compared with the
+    earlier runs; it is a regression when it is slower than their median by
+    the threshold and by the given number of deviations.
+    """
+    runs = [duration for _, duration in sorted(data['durations'].items(),
+                                                key=lambda item: int(item[0]))]
+    latest, earlier = runs[-1], runs[:-1]
+    result = {
+        'language': data['language'], 'version': data['version'], 'source': data['source'],
+        'chessboard-width': data['chessboard-width'], 'runs': len(runs), 'latest': latest,
+        'regression': False
+    }
+    if len(earlier) < options['min-runs']:
+        return result
+
+    median, deviation = get_baseline(earlier)
+    result.update({'median': median, 'deviation': deviation,
+                   'change': (latest - median) / median if median > 0 else 0.0})
+    result['regression'] = result['change'] > options['threshold'] and \
+        latest - median > options['deviations'] * deviation
+    return result
+
+
+def fit_growth(all_data):
+    """
+    Duration growth per language, version and source fitted as exponential
+    function of the width (least squares of the logarithm) over the largest
+    widths; provides the factor per width and the duration of the next width.
+    """
+    groups = {}
+    for data in all_data:
+        durations = list(data['durations'].values())
+        median = statistics.median(durations)
+        if median > 0:
+            groups.setdefault(get_key(data)[1:], []).append((data['chessboard-width'], median))
+
+    results = []
+    for (language, version, source), points in sorted(groups.items()):
+        points = sorted(points)[-FIT_WIDTHS:]
+        if len(points) < 2:
+            continue
+        widths = [width for width, _ in points]
+        logs = [math.log(median) for _, median in points]
+        mean_width, mean_log = statistics.mean(widths), statistics.mean(logs)
+        slope = sum((width - mean_width) * (value - mean_log)
+                    for width, value in zip(widths, logs)) / \
+            sum((width - mean_width) ** 2 for width in widths)
+        intercept = mean_log - slope * mean_width
+        results.append({
+            'language': language, 'version': version, 'source': source,
+            'widths': widths, 'factor': math.exp(slope),
+            'next-width': widths[-1] + 1,
+            'predicted': math.exp(intercept + slope * (widths[-1] + 1))
+        })
+    return results
+
+
+def write_trends(path, all_data, options):
+    """Writing baselines, regressions and growth (JSON); returns the regressions."""
+    baselines = [check_regression(data, options)
+                 for data in sorted(all_data, key=lambda data: (get_key(data)[1:],
+                                                                get_key(data)[0]))]
+    regressions = [baseline for baseline in baselines if baseline['regression']]
+    with open(path, "w") as handle:
+        handle.write(json.dumps({
+            'options': options,
+            'regressions': regressions,
+            'baselines': baselines,
+            'growth': fit_growth(all_data)
+        }, indent=2))
+    return regressions
 
 
 def main():
@@ -82,23 +341,75 @@ def main():
     options = json.loads(open("analyse.json").read())
     descriptors = options['descriptors']
 
+    # log files already processed into results.json (name -> signature)
+    processed = {}
     if os.path.isfile("results/results.json"):
         data = json.loads(open("results/results.json").read())
+        if os.path.isfile("results/processed.json"):
+            processed = json.loads(open("results/processed.json").read())
     else:
         data = []
 
-    for entry in os.listdir("results"):
+    index = create_index(data)
+    changed = False
+    # new measurements for the compact store (appended when logs were known before)
+    new_data = []
+    append = len(processed) > 0
+
+    for entry in sorted(os.listdir("results")):
         if entry.endswith(".log"):
             full = os.path.join(os.getcwd(), "results", entry)
-            text_buffer = open(full).read()
+            signature = get_signature(full)
+            if processed.get(entry) == signature:
+                continue
+
+            if entry in processed:
+                # changed log: its measurements are in the store already
+                append = False
+
+            descriptor = find_descriptor(entry, descriptors)
+            if descriptor:
+                text_buffer = open(full).read()
+                entries = process_descriptor(text_buffer, descriptor)
+                update_data(data, entries, index)
+                new_data.extend(entries)
+                changed = True
+            processed[entry] = signature
+
+    if changed or not os.path.isfile("results/results.json"):
+        with open("results/results.json", "w") as handle:
+            handle.write(json.dumps(data, indent=2))
+
+    if options.get('compact-store', False):
+        # appending when the processed logs are known and unchanged, otherwise writing all
+        if not append or not os.path.isfile("results/results.csv"):
+            write_store("results/results.csv", data, append=False)
+        elif new_data:
+            write_store("results/results.csv", new_data, append=True)
+        if changed or not os.path.isfile("results/summary.json"):
+            write_summary("results/summary.json", data)
+    else:
+        # the report would prefer a summary not updated anymore
+        for path in ["results/results.csv", "results/summary.json"]:
+            if os.path.isfile(path):
+                os.remove(path)
+
+    with open("results/processed.json", "w") as handle:
+        handle.write(json.dumps(processed, indent=2, sort_keys=True))
 
-            for descriptor in descriptors:
-                if entry.find(descriptor['key']) >= 0:
-                    update_data(data, process_descriptor(text_buffer, descriptor))
-                    break
+    regression = dict(REGRESSION)
+    regression.update(options.get('regression', {}))
+    regressions = write_trends("results/trends.json", data, regression)
+    for entry in regressions:
+        print("...regression: {0} {1} ({2}) width {3} took {4:f} seconds, {5:+.1%} of {6:f}"
+              .format(entry['language'], entry['version'], entry['source'],
+                      entry['chessboard-width'], entry['latest'], entry['change'],
+                      entry['median']))
 
-    with open("results/results.json", "w") as handle:
-        handle.write(json.dumps(data, indent=2))
+    wrong = [entry for entry in new_data if 'wrong-solutions' in entry]
+    if wrong:
+        print("...%d runs with a wrong number of solutions." % len(wrong))
+    return 1 if wrong or regressions else 0
 
 if __name__ == "__main__":
-    main()
+    sys.exit(main())
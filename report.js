@@ -9,14 +9,74 @@ angular.module('report', ['ui.bootstrap', 'gridshore.c3js.chart']);
  */
 angular.module('report').controller("ReportController", ['$scope', function($scope) {
     $scope.data = [];
-    // loading JSON data
-	var url = '/results/results.json';
-    $.getJSON(url, function(data) {
+    // loading pre-aggregated averages (see "compact-store" in analyse.json),
+    // all measurements only when there is no summary
+    $.getJSON('/results/summary.json', function(summary) {
         $scope.$apply(function() {
-            $scope.data = data;
+            $scope.data = $scope.getSummaryEntries(summary);
+        });
+    }).fail(function() {
+        $.getJSON('/results/results.json', function(data) {
+            $scope.$apply(function() {
+                $scope.data = data;
+            });
         });
     });
 
+    /**
+     * @ngdoc method
+     * @name getSummaryEntries
+     * @methodOf report.controller:ReportController
+     * @description
+     * Entries of results/summary.json (columns and rows) with the fields of
+     * the entries of results/results.json except the durations.
+     * @param {object} summary dictionary with columns and rows.
+     * @returns {array} array of entries.
+     */
+    $scope.getSummaryEntries = function(summary) {
+        var entries = [];
+        for (var ix = 0; ix < summary.rows.length; ++ix) {
+            var entry = {};
+            for (var column = 0; column < summary.columns.length; ++column) {
+                entry[summary.columns[column]] = summary.rows[ix][column];
+            }
+            entries.push(entry);
+        }
+        return entries;
+    };
+
+    /**
+     * @ngdoc method
+     * @name getAverage
+     * @methodOf report.controller:ReportController
+     * @description
+     * Average duration for one entry (pre-aggregated or of its durations).
+     * @param {object} entry dictionary representing one language, version and chessboard size.
+     * @returns {float} average duration.
+     */
+    $scope.getAverage = function(entry) {
+        if (entry.durations === undefined) {
+            return entry.average;
+        }
+        return $scope.averageDuration(entry.durations);
+    };
+
+    /**
+     * @ngdoc method
+     * @name getCount
+     * @methodOf report.controller:ReportController
+     * @description
+     * Count of measurements for one entry (pre-aggregated or of its durations).
+     * @param {object} entry dictionary representing one language, version and chessboard size.
+     * @returns {int} count of measurements.
+     */
+    $scope.getCount = function(entry) {
+        if (entry.durations === undefined) {
+            return entry.runs;
+        }
+        return $scope.countDurations(entry.durations);
+    };
+
     /**
      * @ngdoc method
      * @name countDurations
@@ -65,8 +125,7 @@ angular.module('report').controller("ReportController", ['$scope', function($sco
     $scope.customSort = function(entryA, entryB) {
         var diff = entryB.value["chessboard-width"] - entryA.value["chessboard-width"];
         if (diff == 0) {
-            diff = $scope.averageDuration(entryA.value["durations"]) -
-                $scope.averageDuration(entryB.value["durations"]);
+            diff = $scope.getAverage(entryA.value) - $scope.getAverage(entryB.value);
         }
         return diff;
     };
@@ -94,10 +153,15 @@ angular.module('report').controller("ReportController", ['$scope', function($sco
      * @description
      * Number of languages.
      * @param {object} entry dictionary representing one language, version and chessboard size.
-     * @returns {array} array with pairs of timestamp and duration.
+     * @returns {array} array with pairs of timestamp and duration
+     *                  (minimum, average and maximum for pre-aggregated entries).
      */
     $scope.getDurationData = function(entry) {
         var sorted = []
+        if (entry.durations === undefined) {
+            return [["min", entry.min], ["average", entry.average], ["max", entry.max]];
+        }
+
         for (var key in entry.durations) {
             sorted.push([key, entry.durations[key]]);
         }
@@ -151,7 +215,7 @@ angular.module('report').controller("ReportController", ['$scope', function($sco
                 $scope.data[i]["chessboard-width"] >= 12) {
                 sorted.push([
                     $scope.data[i]["chessboard-width"],
-                    $scope.averageDuration($scope.data[i].durations)
+                    $scope.getAverage($scope.data[i])
                 ]);
             }
         }
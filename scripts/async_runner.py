@@ -0,0 +1,112 @@
+import os
+import glob
+import time
+import asyncio
+import argparse
+from runner import Runner
+from orchestrate import load_runners
+
+class AsyncRunner:
+    """
+    Running the widths of runners with asyncio: all images are pulled and
+    started once (pre-warmed) concurrently, the output of each run is
+    streamed into the log of its runner, each width has a timeout and the
+    remaining widths of a runner are skipped once a run exceeds the budget.
+    """
+
+    def __init__(self, runners, timeout, budget, parallel):
+        """ Initialize. """
+        self.runners = runners
+        self.timeout = timeout
+        self.budget = budget
+        self.parallel = parallel
+
+    async def execute(self, command, runner=None, timeout=None):
+        """
+        Running command (as list) without shell; the output is streamed into
+        the log of given runner (or discarded). Returns False on timeout.
+        """
+        process = await asyncio.create_subprocess_exec(
+            *command, stdout=asyncio.subprocess.PIPE, stderr=asyncio.subprocess.STDOUT)
+
+        async def stream():
+            """ Appending the output line by line to the log. """
+            async for line in process.stdout:
+                if runner is not None:
+                    runner.log(line.decode(errors='replace').rstrip('\r\n'))
+
+        try:
+            await asyncio.wait_for(asyncio.gather(stream(), process.wait()), timeout)
+            return True
+        except asyncio.TimeoutError:
+            process.kill()
+            await process.wait()
+            return False
+
+    async def prepare(self, image):
+        """ Pulling an image and starting it once so that the first run is not slower. """
+        await self.execute([Runner.DOCKER, 'pull', image])
+        await self.execute([Runner.DOCKER, 'run', '--rm', image, 'true'])
+        print('Prepared %s' % image)
+
+    async def run_width(self, runner, width):
+        """ Running one width; returns the duration or None on timeout. """
+        print('%s: Queen %dx%d' % (runner.get_source(), width, width))
+        name = runner.get_container_name(width)
+        start = time.time()
+        if not await self.execute(runner.get_docker_command(width, name=name),
+                                  runner, self.timeout):
+            # stopping the container as well, killing the client is not enough
+            await self.execute([Runner.DOCKER, 'kill', name])
+            runner.log('...timeout after %g seconds.' % self.timeout)
+            return None
+        duration = time.time() - start
+        for line in await asyncio.to_thread(runner.get_latency, duration, name):
+            runner.log(line)
+        return duration
+
+    async def run_runner(self, runner, semaphore):
+        """ Running the widths of a runner until one exceeds the budget or the timeout. """
+        async with semaphore:
+            for width in runner.get_widths():
+                duration = await self.run_width(runner, width)
+                if duration is None or duration > self.budget:
+                    print('%s: skipping widths after %dx%d' % (runner.get_source(), width, width))
+                    break
+
+    async def run(self):
+        """ Running all runners. """
+        for runner in self.runners:
+            runner.log_header()
+
+        images = sorted(set(runner.get_image() for runner in self.runners))
+        await asyncio.gather(*[self.prepare(image) for image in images])
+
+        semaphore = asyncio.Semaphore(self.parallel)
+        await asyncio.gather(*[self.run_runner(runner, semaphore) for runner in self.runners])
+
+def main():
+    """ Application entry point. """
+    scripts = os.path.dirname(os.path.abspath(__file__))
+
+    parser = argparse.ArgumentParser(description="Running benchmarks with asyncio.")
+    parser.add_argument("scripts", nargs="*",
+                        help="runner scripts (default: all scripts/run_*.py)")
+    parser.add_argument("--timeout", type=float, default=600.0,
+                        help="seconds after which a run is stopped (default: 600)")
+    parser.add_argument("--budget", type=float, default=120.0,
+                        help="skipping larger widths once a run took longer (default: 120)")
+    parser.add_argument("--parallel", type=int, default=1,
+                        help="number of runners running at the same time (default: 1)")
+    parser.add_argument("--docker", default=Runner.DOCKER,
+                        help="docker executable, e.g. a stub for testing (default: docker)")
+    options = parser.parse_args()
+
+    Runner.DOCKER = options.docker
+    names = options.scripts or sorted(glob.glob(os.path.join(scripts, 'run_*.py')))
+    runner = AsyncRunner(load_runners(names), options.timeout, options.budget,
+                         max(1, options.parallel))
+    asyncio.run(runner.run())
+
+if __name__ == "__main__":
+    main()
\ No newline at end of file
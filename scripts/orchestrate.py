@@ -0,0 +1,109 @@
+import os
+import sys
+import glob
+import time
+import queue
+import argparse
+import importlib
+import threading
+from concurrent.futures import ThreadPoolExecutor
+
+class Orchestrator:
+    """
+    Running the benchmarks of several runners concurrently: single threaded
+    runs are pinned to disjoint cores, multiprocessing runs get all cores
+    one after the other when the single threaded runs have finished.
+    """
+
+    def __init__(self, runners, cores):
+        """ Initialize. """
+        self.runners = runners
+        self.cores = cores
+        self.lock = threading.Lock()
+
+    def pull(self):
+        """ Pulling all required docker images concurrently. """
+        images = sorted(set(runner.get_image() for runner in self.runners))
+        with ThreadPoolExecutor(max_workers=len(images)) as executor:
+            for image, output in zip(images, executor.map(
+                    lambda image: self.runners[0].capture([self.runners[0].DOCKER, 'pull', image]), images)):
+                print('Pulled %s' % image)
+                print(output.rstrip('\n'))
+
+    def execute(self, runner, width, cpus):
+        """ Running one width of a runner and appending the captured output to its log. """
+        name = runner.get_container_name(width)
+        start = time.time()
+        output = runner.capture(runner.get_docker_command(width, name=name, cpus=cpus))
+        duration = time.time() - start
+        latency = runner.get_latency(duration, name=name, cpus=cpus)
+        with self.lock:
+            # one run at a time to keep the lines of a run together
+            print('%s: Queen %dx%d (cpus %s)' % (runner.get_source(), width, width, cpus or 'all'))
+            runner.log(output.rstrip('\n'))
+            for line in latency:
+                runner.log(line)
+
+    def run_pinned(self, jobs):
+        """ Running single threaded jobs in parallel, each one on its own core. """
+        cores = queue.Queue()
+        for core in self.cores:
+            cores.put(core)
+
+        def job(runner, width):
+            core = cores.get()
+            try:
+                self.execute(runner, width, str(core))
+            finally:
+                cores.put(core)
+
+        with ThreadPoolExecutor(max_workers=len(self.cores)) as executor:
+            for future in [executor.submit(job, runner, width) for runner, width in jobs]:
+                future.result()
+
+    def run(self):
+        """ Running all widths of all runners. """
+        for runner in self.runners:
+            runner.log_header()
+        self.pull()
+
+        # largest widths first so that they don't finish last
+        jobs = sorted([(runner, width) for runner in self.runners for width in runner.get_widths()],
+                      key=lambda job: -job[1])
+        self.run_pinned([job for job in jobs if not job[0].MULTIPROCESSING])
+
+        # dedicated time slot (all cores) for each multiprocessing run
+        for runner, width in sorted([job for job in jobs if job[0].MULTIPROCESSING],
+                                    key=lambda job: job[1]):
+            self.execute(runner, width, None)
+
+def load_runners(names):
+    """ Creating the concrete runners of given script names (run_*.py). """
+    runners = []
+    for name in names:
+        module = importlib.import_module(os.path.splitext(os.path.basename(name))[0])
+        runners.append(module.ConcreteRunner())
+    return runners
+
+def main():
+    """ Application entry point. """
+    scripts = os.path.dirname(os.path.abspath(__file__))
+    sys.path.insert(0, scripts)
+
+    parser = argparse.ArgumentParser(description="Running benchmarks concurrently.")
+    parser.add_argument("scripts", nargs="*",
+                        help="runner scripts (default: all scripts/run_*.py)")
+    parser.add_argument("--cores", default="1-%d" % (os.cpu_count() - 1),
+                        help="cores for single threaded runs, e.g. 1-7 or 1,3,5 (default: all but 0)")
+    options = parser.parse_args()
+
+    cores = []
+    for part in options.cores.split(','):
+        first, _, last = part.partition('-')
+        cores += range(int(first), int(last or first) + 1)
+
+    names = options.scripts or sorted(glob.glob(os.path.join(scripts, 'run_*.py')))
+    Orchestrator(load_runners(names), cores or [0]).run()
+
+if __name__ == "__main__":
+    main()
\ No newline at end of file
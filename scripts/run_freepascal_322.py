@@ -1,4 +1,3 @@
-import os
 from runner import Runner
 
 class ConcreteRunner(Runner):
@@ -14,21 +13,32 @@ class ConcreteRunner(Runner):
         """ Define concrete log file. """
         return self.logFileName
 
-    def run(self):
+    def get_source(self):
+        """ Source file name. """
+        return 'Queen.pas'
+
+    def get_version(self):
+        """ Language and version. """
+        return 'Freepascal %s' % ConcreteRunner.PASCAL_VERSION
+
+    def get_image(self):
         """
-        Running the queen algorithm for multiple widths.
+        Docker image.
         :see: https://github.com/kveroneau/fpc-docker
-        """       
-        self.log('SOURCE=Queen.pas')
-        self.log('VERSION=Freepascal %s' % ConcreteRunner.PASCAL_VERSION)
-        self.log('TIMESTAMP=%s' %  self.get_timestamp())
+        """
+        return 'kveroneau/fpc:%s' % ConcreteRunner.PASCAL_VERSION
+
+    def get_name(self):
+        """ Name of the docker container. """
+        return 'queen-freepascal'
 
-        self.execute('docker pull kveroneau/fpc:%s' % ConcreteRunner.PASCAL_VERSION)
+    def get_command(self, width):
+        """ Compiling and running Queen.pas for one width. """
+        return ['bash', '-c', 'fpc -O4 -o/tmp/Queen ./Queen.pas && /tmp/Queen %d' % width]
 
-        for width in range(8, 16+1):
-            print('Queen %(width)dx%(width)d' % {'width': width})
-            self.execute('docker run -it --rm --name queen-freepascal -v "%s\src:/usr/src" -w /usr/src kveroneau/fpc:%s bash -c "fpc -O4 -o/tmp/Queen ./Queen.pas && /tmp/Queen %d">> %s' % 
-                (os.getcwd(), ConcreteRunner.PASCAL_VERSION, width, self.get_log()))
+    def get_startup_command(self):
+        """ Starting a container only (Queen.pas is compiled as part of each run). """
+        return ['true']
 
 if __name__ == "__main__":
     concrete = ConcreteRunner()
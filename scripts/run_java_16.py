@@ -1,4 +1,3 @@
-import os
 from runner import Runner
 
 class ConcreteRunner(Runner):
@@ -14,21 +13,32 @@ class ConcreteRunner(Runner):
         """ Define concrete log file. """
         return self.logFileName
 
-    def run(self):
+    def get_source(self):
+        """ Source file name. """
+        return 'Queen.java'
+
+    def get_version(self):
+        """ Language and version. """
+        return 'Java %s' % ConcreteRunner.JAVA_VERSION
+
+    def get_image(self):
         """
-        Running the queen algorithm for multiple widths.
+        Docker image.
         :see: https://hub.docker.com/_/openjdk/
-        """       
-        self.log('SOURCE=Queen.java')
-        self.log('VERSION=Java %s' % ConcreteRunner.JAVA_VERSION)
-        self.log('TIMESTAMP=%s' %  self.get_timestamp())
+        """
+        return 'openjdk:%s' % ConcreteRunner.JAVA_VERSION
+
+    def get_name(self):
+        """ Name of the docker container. """
+        return 'queen-java'
 
-        self.execute('docker pull openjdk:%s' % ConcreteRunner.JAVA_VERSION)
+    def get_command(self, width):
+        """ Running Queen.java for one width. """
+        return ['java', './Queen.java', str(width)]
 
-        for width in range(8, 16+1):
-            print('Queen %(width)dx%(width)d' % {'width': width})
-            self.execute('docker run -it --rm --name queen-java -v "%s\src:/usr/src" -w /usr/src openjdk:%s java ./Queen.java %d >> %s' % 
-                (os.getcwd(), ConcreteRunner.JAVA_VERSION, width, self.get_log()))
+    def get_startup_command(self):
+        """ Starting the JVM only. """
+        return ['java', '-version']
 
 if __name__ == "__main__":
     concrete = ConcreteRunner()
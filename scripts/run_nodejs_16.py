@@ -1,4 +1,3 @@
-import os
 from runner import Runner
 
 class ConcreteRunner(Runner):
@@ -14,21 +13,32 @@ class ConcreteRunner(Runner):
         """ Define concrete log file. """
         return self.logFileName
 
-    def run(self):
+    def get_source(self):
+        """ Source file name. """
+        return 'Queen_node.js'
+
+    def get_version(self):
+        """ Language and version. """
+        return 'Nodejs %s' % ConcreteRunner.NODE_VERSION
+
+    def get_image(self):
         """
-        Running the queen algorithm for multiple widths.
+        Docker image.
         :see: https://hub.docker.com/_/node/
-        """       
-        self.log('SOURCE=Queen_node.js')
-        self.log('VERSION=Nodejs %s' % ConcreteRunner.NODE_VERSION)
-        self.log('TIMESTAMP=%s' %  self.get_timestamp())
+        """
+        return 'node:%s' % ConcreteRunner.NODE_VERSION
+
+    def get_name(self):
+        """ Name of the docker container. """
+        return 'queen-nodejs'
 
-        self.execute('docker pull node:%s' % ConcreteRunner.NODE_VERSION)
+    def get_command(self, width):
+        """ Running Queen_node.js for one width. """
+        return ['node', './Queen_node.js', str(width)]
 
-        for width in range(8, 16+1):
-            print('Queen %(width)dx%(width)d' % {'width': width})
-            self.execute('docker run -it --rm --name queen-nodejs -v "%s\src:/usr/src" -w /usr/src node:%s node ./Queen_node.js %d >> %s' % 
-                (os.getcwd(), ConcreteRunner.NODE_VERSION, width, self.get_log()))
+    def get_startup_command(self):
+        """ Starting Node.js only. """
+        return ['node', '-e', '0']
 
 if __name__ == "__main__":
     concrete = ConcreteRunner()
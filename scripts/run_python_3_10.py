@@ -1,4 +1,3 @@
-import os
 from runner import Runner
 
 class ConcreteRunner(Runner):
@@ -14,18 +13,33 @@ class ConcreteRunner(Runner):
         """ Define concrete log file. """
         return self.logFileName
 
-    def run(self):
-        """ Running the queen algorithm for multiple widths. """       
-        self.log('SOURCE=Queen.py')
-        self.log('VERSION=Python %s' % ConcreteRunner.PYTHON_VERSION)
-        self.log('TIMESTAMP=%s' %  self.get_timestamp())
+    def get_source(self):
+        """ Source file name. """
+        return 'Queen.py'
 
-        self.execute('docker pull python:%s' % ConcreteRunner.PYTHON_VERSION)
+    def get_version(self):
+        """ Language and version. """
+        return 'Python %s' % ConcreteRunner.PYTHON_VERSION
 
-        for width in range(8, 15+1):
-            print('Queen %(width)dx%(width)d' % {'width': width})
-            self.execute('docker run -it --rm --name queen-python -v "%s\src:/usr/src" -w /usr/src python:%s python ./Queen.py %d >> %s' % 
-                (os.getcwd(), ConcreteRunner.PYTHON_VERSION, width, self.get_log()))
+    def get_image(self):
+        """ Docker image. """
+        return 'python:%s' % ConcreteRunner.PYTHON_VERSION
+
+    def get_name(self):
+        """ Name of the docker container. """
+        return 'queen-python'
+
+    def get_widths(self):
+        """ Widths of the board to run the queen algorithm for. """
+        return range(8, 15+1)
+
+    def get_command(self, width):
+        """ Running Queen.py for one width. """
+        return ['python', './Queen.py', str(width)]
+
+    def get_startup_command(self):
+        """ Starting Python importing Queen.py only (import times on stderr). """
+        return ['python', '-X', 'importtime', '-c', 'import Queen']
 
 if __name__ == "__main__":
     concrete = ConcreteRunner()
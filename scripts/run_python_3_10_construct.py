@@ -0,0 +1,46 @@
+from runner import Runner
+
+class ConcreteRunner(Runner):
+    """ Runner for Python 3.10 running Queen.py constructing one solution for large widths. """
+
+    PYTHON_VERSION = '3.10'
+
+    def __init__(self):
+        """ Initialize. """
+        self.logFileName = 'results/python_%s_%s.construct.py.log' % (ConcreteRunner.PYTHON_VERSION, self.get_timestamp())
+
+    def get_log(self):
+        """ Define concrete log file. """
+        return self.logFileName
+
+    def get_source(self):
+        """ Source file name. """
+        return 'Queen.py (construct)'
+
+    def get_version(self):
+        """ Language and version. """
+        return 'Python %s' % ConcreteRunner.PYTHON_VERSION
+
+    def get_image(self):
+        """ Docker image. """
+        return 'python:%s' % ConcreteRunner.PYTHON_VERSION
+
+    def get_name(self):
+        """ Name of the docker container. """
+        return 'queen-python'
+
+    def get_widths(self):
+        """ Widths of the board to construct a solution for. """
+        return [1000, 10000, 100000, 1000000]
+
+    def get_command(self, width):
+        """ Constructing one solution with Queen.py for one width. """
+        return ['python', './Queen.py', str(width), '--construct']
+
+    def get_startup_command(self):
+        """ Starting Python importing Queen.py only (import times on stderr). """
+        return ['python', '-X', 'importtime', '-c', 'import Queen']
+
+if __name__ == "__main__":
+    concrete = ConcreteRunner()
+    concrete.run()
\ No newline at end of file
@@ -1,10 +1,10 @@
-import os
 from runner import Runner
 
 class ConcreteRunner(Runner):
     """ Runner for Python 3.10 running Queen_multipressing.py for multiple widths. """
 
     PYTHON_VERSION = '3.10'
+    MULTIPROCESSING = True
 
     def __init__(self):
         """ Initialize. """
@@ -14,18 +14,29 @@ class ConcreteRunner(Runner):
         """ Define concrete log file. """
         return self.logFileName
 
-    def run(self):
-        """ Running the queen algorithm for multiple widths. """       
-        self.log('SOURCE=Queen_multiprocessing.py')
-        self.log('VERSION=Python %s' % ConcreteRunner.PYTHON_VERSION)
-        self.log('TIMESTAMP=%s' %  self.get_timestamp())
+    def get_source(self):
+        """ Source file name. """
+        return 'Queen_multiprocessing.py'
 
-        self.execute('docker pull python:%s' % ConcreteRunner.PYTHON_VERSION)
+    def get_version(self):
+        """ Language and version. """
+        return 'Python %s' % ConcreteRunner.PYTHON_VERSION
 
-        for width in range(8, 16+1):
-            print('Queen %(width)dx%(width)d' % {'width': width})
-            self.execute('docker run -it --rm --name queen-python -v "%s\src:/usr/src" -w /usr/src python:%s python ./Queen_multiprocessing.py %d >> %s' % 
-                (os.getcwd(), ConcreteRunner.PYTHON_VERSION, width, self.get_log()))
+    def get_image(self):
+        """ Docker image. """
+        return 'python:%s' % ConcreteRunner.PYTHON_VERSION
+
+    def get_name(self):
+        """ Name of the docker container. """
+        return 'queen-python'
+
+    def get_command(self, width):
+        """ Running Queen_multiprocessing.py for one width. """
+        return ['python', './Queen_multiprocessing.py', str(width)]
+
+    def get_startup_command(self):
+        """ Starting Python importing Queen_multiprocessing.py only (import times on stderr). """
+        return ['python', '-X', 'importtime', '-c', 'import Queen_multiprocessing']
 
 if __name__ == "__main__":
     concrete = ConcreteRunner()
@@ -0,0 +1,44 @@
+from runner import Runner
+
+class ConcreteRunner(Runner):
+    """ Runner for Python 3.10 running Queen_multipressing.py for all widths with one warm pool. """
+
+    PYTHON_VERSION = '3.10'
+    MULTIPROCESSING = True
+    MULTI_WIDTH = True
+
+    def __init__(self):
+        """ Initialize. """
+        self.logFileName = 'results/python_%s_%s.multiprocessing-warm.py.log' % (ConcreteRunner.PYTHON_VERSION, self.get_timestamp())
+
+    def get_log(self):
+        """ Define concrete log file. """
+        return self.logFileName
+
+    def get_source(self):
+        """ Source file name. """
+        return 'Queen_multiprocessing.py (warm pool)'
+
+    def get_version(self):
+        """ Language and version. """
+        return 'Python %s' % ConcreteRunner.PYTHON_VERSION
+
+    def get_image(self):
+        """ Docker image. """
+        return 'python:%s' % ConcreteRunner.PYTHON_VERSION
+
+    def get_name(self):
+        """ Name of the docker container. """
+        return 'queen-python'
+
+    def get_widths(self):
+        """ One run solving all widths up to 16 in one process (pool startup is logged separately). """
+        return [16]
+
+    def get_command(self, width):
+        """ Running Queen_multiprocessing.py for all widths from 8 up to given one. """
+        return ['python', './Queen_multiprocessing.py', '8', '--to', str(width)]
+
+if __name__ == "__main__":
+    concrete = ConcreteRunner()
+    concrete.run()
\ No newline at end of file
@@ -1,19 +1,75 @@
 import os
+import re
 import time
+import itertools
 import datetime
+import subprocess
   
 class Runner:
     """ Base class for runner """
 
+    MULTIPROCESSING = False  # True when the benchmark is using all cores itself
+    MULTI_WIDTH = False  # True when one run solves several widths (no process and startup time per width)
+    DOCKER = 'docker'  # docker executable (can be replaced by a stub for testing)
+    CONTAINERS = itertools.count()  # numbering the containers started by this process
+
     def get_log(self):
         """ Forcing implementation of path and filename for current log. """
         raise 'Missing get_log(self) implementation!'
 
+    def get_source(self):
+        """ Forcing implementation of the source file name (SOURCE in log). """
+        raise NotImplementedError('Missing get_source(self) implementation!')
+
+    def get_version(self):
+        """ Forcing implementation of language and version (VERSION in log). """
+        raise NotImplementedError('Missing get_version(self) implementation!')
+
+    def get_image(self):
+        """ Forcing implementation of the docker image (name:tag). """
+        raise NotImplementedError('Missing get_image(self) implementation!')
+
+    def get_command(self, width):
+        """ Forcing implementation of the command (as list) running inside the container. """
+        raise NotImplementedError('Missing get_command(self, width) implementation!')
+
+    def get_startup_command(self):
+        """ Command (as list) starting the runtime without solving anything (None: not measured). """
+        return None
+
+    def get_name(self):
+        """ Name of the docker container. """
+        return 'queen'
+
+    def get_widths(self):
+        """ Widths of the board to run the queen algorithm for. """
+        return range(8, 16+1)
+
+    def get_container_name(self, width):
+        """
+        Container name unique for concurrent runs: several runners share
+        get_name() but the log file is the runner's own.
+        """
+        stem = os.path.splitext(os.path.basename(self.get_log()))[0]
+        return '%s-%s-%d-%d-%d' % (self.get_name(), re.sub('[^a-zA-Z0-9_.-]', '-', stem),
+                                   width, os.getpid(), next(Runner.CONTAINERS))
+
     def get_timestamp(self):
         """ Get current date as unix timestamp. """
         now = datetime.datetime.now()
         return int(datetime.datetime.timestamp(now) * 1000)
 
+    def get_docker_command(self, width, name=None, cpus=None, interactive=False, program=None):
+        """ Docker command (as list) running the queen algorithm for one width (or given program as list). """
+        command = [self.DOCKER, 'run']
+        if interactive:
+            command.append('-it')
+        command += ['--rm', '--name', name or self.get_name()]
+        if cpus is not None:
+            command += ['--cpuset-cpus', cpus]
+        command += ['-v', '%s:/usr/src' % os.path.join(os.getcwd(), 'src'), '-w', '/usr/src']
+        return command + [self.get_image()] + (program or self.get_command(width))
+
     def log(self, message):
         """ Append message to log file. """
         assert isinstance(message, str)
@@ -22,7 +78,72 @@ class Runner:
             handle.write(message)
             handle.write('\n')
 
+    def log_header(self):
+        """ Source, version and timestamp of the run. """
+        self.log('SOURCE=%s' % self.get_source())
+        self.log('VERSION=%s' % self.get_version())
+        self.log('TIMESTAMP=%s' %  self.get_timestamp())
+
     def execute(self, command):
         """ Execute shell command. """
         assert isinstance(command, str)
-        os.system(command)
\ No newline at end of file
+        os.system(command)
+
+    def capture(self, command):
+        """ Execute command (as list) without shell; returns stdout and stderr. """
+        assert isinstance(command, list)
+        process = subprocess.run(command, stdout=subprocess.PIPE, stderr=subprocess.STDOUT,
+                                 universal_newlines=True)
+        return process.stdout
+
+    def measure_startup(self, name=None, cpus=None):
+        """
+        Log lines with the time of starting the runtime (container included)
+        and of the imports (Python with -X importtime); empty when not measured.
+        """
+        command = self.get_startup_command()
+        if command is None:
+            return []
+        start = time.time()
+        output = self.capture(self.get_docker_command(
+            0, name='%s-startup' % (name or self.get_name()), cpus=cpus, program=command))
+        lines = ['...startup took %f seconds.' % (time.time() - start)]
+        imports = Runner.get_import_time(output)
+        if imports is not None:
+            lines.append('...imports took %f seconds.' % imports)
+        return lines
+
+    def get_latency(self, duration, name=None, cpus=None):
+        """
+        Log lines with the process time of a run and the startup and import
+        time; empty when one run solves several widths.
+        """
+        if self.MULTI_WIDTH:
+            return []
+        return ['...process took %f seconds.' % duration] + self.measure_startup(name, cpus)
+
+    @staticmethod
+    def get_import_time(output):
+        """ Cumulative time (seconds) of the top level imports of -X importtime or None. """
+        total, found = 0, False
+        for line in output.splitlines():
+            parts = line.split('|')
+            if line.startswith('import time:') and len(parts) == 3 and \
+                    parts[1].strip().isdigit() and not parts[2].startswith('   '):
+                total += int(parts[1])
+                found = True
+        return total / 1e6 if found else None
+
+    def run(self):
+        """ Running the queen algorithm for multiple widths (one after the other). """
+        self.log_header()
+        self.execute('%s pull %s' % (self.DOCKER, self.get_image()))
+
+        for width in self.get_widths():
+            print('Queen %(width)dx%(width)d' % {'width': width})
+            command = ['"%s"' % part if ' ' in part else part
+                       for part in self.get_docker_command(width, interactive=True)]
+            start = time.time()
+            self.execute('%s >> %s' % (' '.join(command), self.get_log()))
+            for line in self.get_latency(time.time() - start):
+                self.log(line)
\ No newline at end of file
@@ -20,11 +20,71 @@
   WHETHER IN AN ACTION OF CONTRACT, TORT OR OTHERWISE, ARISING FROM,
   OUT OF OR IN CONNECTION WITH THE SOFTWARE OR THE USE OR OTHER DEALINGS IN THE SOFTWARE.
 """
-# pylint: disable=E0602
+# pylint: disable=E0602,C0415
 import sys
 import time
+# other modules are imported where needed to keep the startup short (see quickMain())
 
 OUTPUT = False    # enable/disable of printing the solutions
+ENGINES = ("list", "bits", "numpy")  # available search engines (first one is default)
+BATCH_SIZE = 4096  # number of solutions written at once when streaming them
+CHUNK_SIZE = 65536  # number of partial boards expanded at once (numpy engine)
+
+
+class Constraints:
+    """
+    Board of a N-queens variant: height rows (at most width) with one queen
+    each, blocked squares, queens placed in advance and optionally super
+    queens (moving like a knight as well). Squares are (column, row).
+    """
+    def __init__(self, width, height=None, blocked=(), placed=(), superQueens=False):
+        self.width = width
+        self.height = width if height is None else height
+        if not 0 < self.height <= width:
+            raise ValueError("the height must be 1..%d (one queen per row)" % width)
+        for column, row in list(blocked) + list(placed):
+            if not (0 <= column < width and 0 <= row < self.height):
+                raise ValueError("square (%d,%d) is not on the board" % (column + 1, row + 1))
+
+        self.blocked = list(blocked)
+        self.placed = list(placed)
+        self.superQueens = superQueens
+        self.allColumns = (1 << width) - 1
+        # allowed columns per row as bitboard
+        self.allowed = self.height * [self.allColumns]
+        for column, row in self.blocked:
+            self.allowed[row] &= ~(1 << column)
+        for column, row in self.placed:
+            self.allowed[row] &= 1 << column
+            for other in range(self.height):
+                if other != row:
+                    self.allowed[other] &= ~self.attacks(column, abs(other - row))
+
+    # columns attacked by a queen in given column in a row given distance away
+    def attacks(self, column, distance):
+        mask = 1 << column | 1 << (column + distance) | (1 << column) >> distance
+        if self.superQueens and distance in (1, 2):
+            jump = 3 - distance
+            mask |= 1 << (column + jump) | (1 << column) >> jump
+        return mask & self.allColumns
+
+    # the plain N-queens problem is solved by the fast path
+    def isPlain(self):
+        return self.height == self.width and not self.superQueens and \
+            all(mask == self.allColumns for mask in self.allowed)
+
+    # short description for the log
+    def describe(self):
+        parts = []
+        if self.height != self.width:
+            parts.append("rows=%d" % self.height)
+        if self.blocked:
+            parts.append("blocked=%d" % len(self.blocked))
+        if self.placed:
+            parts.append("placed=%d" % len(self.placed))
+        if self.superQueens:
+            parts.append("super")
+        return ", ".join(parts)
 
 
 class Queen:
@@ -40,6 +100,27 @@ class Queen:
         self.diagonals2 = numberOfDiagonals * [0]
         # list of solutions
         self.solutions = set()
+        # number of solutions (count mode only, no solutions are stored)
+        self.count = 0
+        # number of solutions unique under rotation and reflection
+        self.unique = 0
+        # column of the queen per row (fundamental mode)
+        self.rows = self.width * [-1]
+        # details of the search (profile mode only)
+        self.profile = None
+        # rows and columns ordered from the middle to the edges (iterSolutions only)
+        self.middleOut = []
+        # hits, misses, maxsize and currsize of the cache (memo mode only)
+        self.cacheInfo = None
+        # all columns as bitboard (used by the bits engine)
+        self.allColumns = (1 << self.width) - 1
+        # allowed columns per row, last row and knight moves of the masked
+        # engine (all columns for the plain board, see useConstraints())
+        self.masks = self.width * [self.allColumns]
+        self.lastMaskRow = self.lastRow
+        self.superQueens = False
+        # count function per row (a cached one for the last rows in memo mode)
+        self.counters = self.width * [self.countMasked]
 
     # starts the search with initial parameters and organizing
     # to search the half only
@@ -52,7 +133,11 @@ class Queen:
             self.diagonals1[ixDiag1] = 1
             self.diagonals2[ixDiag2] = 1
 
-            self.calculate(1, [k for k in range(self.width) if not k == column])
+            if self.lastRow == 0:
+                # the first queen is the solution of the 1x1 board
+                self.addSolution()
+            else:
+                self.calculate(1, [k for k in range(self.width) if not k == column])
 
             # Freeing column and diagonals depending on current row and column
             self.diagonals1[ixDiag1] = 0
@@ -81,53 +166,782 @@ class Queen:
 
             # all queens have been placed?
             if row == self.lastRow:
-                solutionA = self.columns[0:]
-                self.solutions.add(tuple(solutionA))
+                self.addSolution()
+            else:
+                # trying to place next queen...
+                self.calculate(row + 1, [k for k in columnRange if k != column])
 
-                # mirrored left <-> right
-                solutionB = tuple(reversed(solutionA))
-                self.solutions.add(solutionB)
+            # Freeing column and diagonals depending on current row and column
+            self.diagonals1[ixDiag1] = 0
+            self.diagonals2[ixDiag2] = 0
+
+    # starts the search like run() but recording per row the placed queens
+    # (nodes) and the columns rejected by each diagonal check as well as the
+    # time spent adding solutions; run() is not touched by this.
+    def runProfiled(self):
+        self.profile = {
+            'engine': 'list',
+            'width': self.width,
+            'nodes': self.width * [0],
+            'pruned-diagonal1': self.width * [0],
+            'pruned-diagonal2': self.width * [0],
+            'solution-time': 0
+        }
+
+        start = time.perf_counter_ns()
+        for column in range(self.width // 2 + self.width % 2):
+            self.profile['nodes'][0] += 1
+            ixDiag1 = column
+            ixDiag2 = self.lastRow + column
+            # occupying column and diagonals depending on current row and column
+            self.columns[column] = 0
+            self.diagonals1[ixDiag1] = 1
+            self.diagonals2[ixDiag2] = 1
 
-                # mirrored top <-> bottom
-                self.solutions.add(tuple(map(lambda n: self.lastRow - n, solutionA)))
-                # mirrored top <-> bottom and left <-> right
-                self.solutions.add(tuple(map(lambda n: self.lastRow - n, solutionB)))
+            if self.lastRow == 0:
+                # the first queen is the solution of the 1x1 board
+                self.addSolution()
+            else:
+                self.calculateProfiled(1, [k for k in range(self.width) if not k == column])
+
+            # Freeing column and diagonals depending on current row and column
+            self.diagonals1[ixDiag1] = 0
+            self.diagonals2[ixDiag2] = 0
+
+        self.profile['search-time'] = (time.perf_counter_ns() - start) / 1e9
+        self.profile['solution-time'] /= 1e9
+
+    # searches like calculate() recording the details into the profile
+    def calculateProfiled(self, row, columnRange):
+        profile = self.profile
+        for column in columnRange:
+            # relating diagonale '\' depending on current row and column
+            ixDiag1 = row + column
+
+            if self.diagonals1[ixDiag1] == 1:
+                profile['pruned-diagonal1'][row] += 1
+                continue
+
+            # relating diagonale '/' depending on current row and column
+            ixDiag2 = self.lastRow - row + column
+
+            # is one of the relating diagonals OCCUPIED by a queen?
+            if self.diagonals2[ixDiag2] == 1:
+                profile['pruned-diagonal2'][row] += 1
+                continue
+
+            # occupying column and diagonals depending on current row and column
+            profile['nodes'][row] += 1
+            self.columns[column] = row
+            self.diagonals1[ixDiag1] = 1
+            self.diagonals2[ixDiag2] = 1
+
+            # all queens have been placed?
+            if row == self.lastRow:
+                start = time.perf_counter_ns()
+                self.addSolution()
+                profile['solution-time'] += time.perf_counter_ns() - start
             else:
                 # trying to place next queen...
-                self.calculate(row + 1, [k for k in columnRange if k != column])
+                self.calculateProfiled(row + 1, [k for k in columnRange if k != column])
+
+            # Freeing column and diagonals depending on current row and column
+            self.diagonals1[ixDiag1] = 0
+            self.diagonals2[ixDiag2] = 0
+
+    # starts the search like run() but with columns and diagonals
+    # represented as integer bitboards (masked engine)
+    def runBits(self):
+        self.solutions = set(self.generateSolutions())
+
+    # provides all solutions one by one while searching with integer bitboards;
+    # the first queen is restricted to one column of the left half by the mask
+    # of the first row and the left <-> right mirror is provided unless it is
+    # in the middle column (then the search finds it), so nothing is stored
+    def generateSolutions(self):
+        for column in range(self.width // 2 + self.width % 2):
+            mirror = 2 * column + 1 != self.width
+            self.masks[0] = 1 << column
+            for solution in self.generateMasked(0, 0, 0, 0, 0, 0):
+                yield solution
+                if mirror:
+                    yield solution[::-1]
+        self.masks[0] = self.allColumns
+
+    # provides the solutions one by one as soon as they are found, at most
+    # given limit of them and optionally with the first row queen in given
+    # column only. Each step continues with the row having the fewest free
+    # columns (rows and columns near the middle first), so the first
+    # solutions are found quickly even for large widths.
+    def iterSolutions(self, limit=None, firstRow=None):
+        if limit is not None and limit <= 0:
+            return
+        if firstRow is not None and not 0 <= firstRow < self.width:
+            return
+
+        middle = self.lastRow / 2.0
+        self.middleOut = sorted(range(self.width), key=lambda n: abs(n - middle))
+
+        found = 0
+        if firstRow is None:
+            solutions = self.generateFewestFirst(0, 0, 0, 0, 0)
+        else:
+            bit = 1 << firstRow
+            self.columns[firstRow] = 0
+            solutions = self.generateFewestFirst(1, 1, bit, bit, bit << self.lastRow)
+
+        for solution in solutions:
+            yield solution
+            found += 1
+            if found == limit:
+                return
+
+    # searches yielding each solution as tuple; rows is the bitboard of the
+    # rows having a queen and the diagonals are indexed by row+column ('\')
+    # and lastRow-row+column ('/') because the rows are not placed in order.
+    def generateFewestFirst(self, placed, rows, cols, diag1, diag2):
+        if placed == self.width:
+            yield tuple(self.columns)
+            return
+
+        # next row is the one with the fewest free columns
+        bestRow, bestAvail, bestCount = -1, 0, self.width + 1
+        for row in self.middleOut:
+            if rows >> row & 1:
+                continue
+            avail = self.allColumns & ~(cols | diag1 >> row | diag2 >> (self.lastRow - row))
+            count = bin(avail).count("1")
+            if count < bestCount:
+                bestRow, bestAvail, bestCount = row, avail, count
+                if count <= 1:
+                    break
+
+        for column in self.middleOut:
+            bit = 1 << column
+            if not bestAvail & bit:
+                continue
+            self.columns[column] = bestRow
+            yield from self.generateFewestFirst(placed + 1, rows | (1 << bestRow), cols | bit,
+                                                diag1 | bit << bestRow,
+                                                diag2 | bit << (self.lastRow - bestRow))
+
+    # counts all solutions without storing them; a first queen in the left half
+    # has a mirrored solution in the right half, the middle column (odd width)
+    # mirrors onto itself and is counted once
+    def runCount(self):
+        self.count = 0
+        for column in range(self.width // 2 + self.width % 2):
+            factor = 1 if 2 * column + 1 == self.width else 2
+            ixDiag1 = column
+            ixDiag2 = self.lastRow + column
+            # occupying column and diagonals depending on current row and column
+            self.diagonals1[ixDiag1] = 1
+            self.diagonals2[ixDiag2] = 1
+
+            if self.lastRow == 0:
+                # the first queen is the solution of the 1x1 board
+                self.count += 1
+            else:
+                self.count += factor * self.calculateCount(
+                    1, [k for k in range(self.width) if not k == column])
 
             # Freeing column and diagonals depending on current row and column
             self.diagonals1[ixDiag1] = 0
             self.diagonals2[ixDiag2] = 0
+        return self.count
+
+    # counts all solutions like calculate() but without storing them
+    def calculateCount(self, row, columnRange):
+        found = 0
+        for column in columnRange:
+            # relating diagonale '\' depending on current row and column
+            ixDiag1 = row + column
+
+            if self.diagonals1[ixDiag1] == 1:
+                continue
+
+            # relating diagonale '/' depending on current row and column
+            ixDiag2 = self.lastRow - row + column
+
+            # is one of the relating diagonals OCCUPIED by a queen?
+            if self.diagonals2[ixDiag2] == 1:
+                continue
+
+            # all queens have been placed?
+            if row == self.lastRow:
+                found += 1
+                continue
+
+            # occupying diagonals depending on current row and column
+            self.diagonals1[ixDiag1] = 1
+            self.diagonals2[ixDiag2] = 1
+
+            # trying to place next queen...
+            found += self.calculateCount(row + 1, [k for k in columnRange if k != column])
+
+            # Freeing diagonals depending on current row and column
+            self.diagonals1[ixDiag1] = 0
+            self.diagonals2[ixDiag2] = 0
+        return found
+
+    # counts all solutions like runCount() but using integer bitboards; the
+    # first queen is restricted to one column by the mask of the first row
+    def runCountBits(self):
+        self.count = 0
+        for column in range(self.width // 2 + self.width % 2):
+            factor = 1 if 2 * column + 1 == self.width else 2
+            self.masks[0] = 1 << column
+            self.count += factor * self.countMasked(0, 0, 0, 0, 0, 0)
+        self.masks[0] = self.allColumns
+        return self.count
+
+    # the masked engine searches the boards of given constraints from now on
+    def useConstraints(self, constraints):
+        self.masks = list(constraints.allowed)
+        self.lastMaskRow = constraints.height - 1
+        self.superQueens = constraints.superQueens
+        self.counters = constraints.height * [self.countMasked]
+
+    # counts the solutions of a N-queens variant (see Constraints) with the
+    # masked engine; the plain board takes the fast path (half of the board)
+    def runVariant(self, constraints):
+        if constraints.isPlain():
+            return self.runCountBits()
+        self.useConstraints(constraints)
+        self.count = self.countMasked(0, 0, 0, 0, 0, 0)
+        return self.count
+
+    # provides the solutions of a N-queens variant one by one (row per column
+    # or -1 for a column without queen); the plain board takes the fast path
+    def generateVariant(self, constraints):
+        if constraints.isPlain():
+            return self.generateSolutions()
+        self.useConstraints(constraints)
+        return self.generateMasked(0, 0, 0, 0, 0, 0)
+
+    # counts the completions with the queens of the rows before given one
+    # placed; a set bit in cols, diag1, diag2 or knight1 is a column attacked
+    # in the current row, knight2 are the columns attacked by knight moves in
+    # the next row (super queens only) and only the columns of the mask of a
+    # row are allowed. The next row is counted by the function of counters.
+    def countMasked(self, row, cols, diag1, diag2, knight1, knight2):
+        avail = self.masks[row] & ~(cols | diag1 | diag2 | knight1)
+        if row == self.lastMaskRow:
+            return bin(avail).count("1")
+
+        found = 0
+        count = self.counters[row + 1]
+        superQueens = self.superQueens
+        while avail:
+            # lowest free column
+            bit = avail & -avail
+            avail ^= bit
+            found += count(row + 1, cols | bit, ((diag1 | bit) << 1) & self.allColumns,
+                           (diag2 | bit) >> 1,
+                           knight2 | (bit << 2 | bit >> 2) if superQueens else 0,
+                           (bit << 1 | bit >> 1) if superQueens else 0)
+        return found
+
+    # searches like countMasked() yielding each solution as tuple (row per
+    # column, -1 for a column without queen)
+    def generateMasked(self, row, cols, diag1, diag2, knight1, knight2):
+        avail = self.masks[row] & ~(cols | diag1 | diag2 | knight1)
+        superQueens = self.superQueens
+        while avail:
+            # lowest free column
+            bit = avail & -avail
+            avail ^= bit
+            column = bit.bit_length() - 1
+            self.columns[column] = row
+
+            # all queens have been placed?
+            if row == self.lastMaskRow:
+                yield tuple(self.columns)
+            else:
+                # trying to place next queen...
+                yield from self.generateMasked(
+                    row + 1, cols | bit, ((diag1 | bit) << 1) & self.allColumns,
+                    (diag2 | bit) >> 1, knight2 | (bit << 2 | bit >> 2) if superQueens else 0,
+                    (bit << 1 | bit >> 1) if superQueens else 0)
+            self.columns[column] = -1
+
+    # counts all solutions like runCountBits() but remembering the number of
+    # completions of the boards with at least width-depth rows placed in a
+    # least recently used cache of given size; the same remaining columns and
+    # diagonals are often reached by different placements of the first rows.
+    # The first row is never cached, its mask changes with the first queen.
+    def runCountMemo(self, depth, size):
+        import functools
+
+        cached = functools.lru_cache(maxsize=size)(self.countMasked)
+        memoRow = max(1, self.width - depth)
+        self.counters = [cached if row >= memoRow else self.countMasked
+                         for row in range(self.width)]
+        self.runCountBits()
+        self.cacheInfo = cached.cache_info()
+        self.counters = self.width * [self.countMasked]
+        return self.count
+
+    # counts the fundamental solutions (unique under rotation and reflection)
+    # and all solutions. A placement is taken when it is the smallest of its
+    # variants (queen columns row by row); the first queen at column c then
+    # requires the queen of the last row and the queens of the first and last
+    # column to be within c..width-1-c which is removed from the masks in advance.
+    def runFundamental(self):
+        self.unique = 0
+        self.count = 0
+
+        edges = 1 | (1 << self.lastRow)
+        for column in range(self.width // 2 + self.width % 2):
+            inner = ((1 << (self.lastRow - column + 1)) - 1) & ~((1 << column) - 1)
+            for row in range(self.width):
+                outside = row < column or row > self.lastRow - column
+                self.masks[row] = self.allColumns & ~edges if outside else self.allColumns
+            self.masks[self.lastRow] &= inner
+            self.masks[0] = 1 << column
+
+            for solution in self.generateMasked(0, 0, 0, 0, 0, 0):
+                for queenColumn, row in enumerate(solution):
+                    self.rows[row] = queenColumn
+                variants = self.numberOfVariants()
+                if variants > 0:
+                    self.unique += 1
+                    self.count += variants
+
+        self.masks = self.width * [self.allColumns]
+        return self.count
+
+    # number of distinct variants (rotations and reflections) of the current
+    # placement when it is the smallest one of them, otherwise 0
+    def numberOfVariants(self):
+        placement = tuple(self.rows)
+        transposed = self.width * [0]
+        for row, column in enumerate(placement):
+            transposed[column] = row
+
+        variants = set()
+        for variant in (placement, tuple(transposed)):
+            mirrored = tuple([self.lastRow - column for column in variant])
+            variants.update((variant, variant[::-1], mirrored, mirrored[::-1]))
+        return len(variants) if placement == min(variants) else 0
+
+    # counts all solutions breadth-first with numpy (imported on demand): the
+    # partial boards of a row are arrays of column and diagonal bitboards
+    # and all of their children are calculated at once; expanding chunks of
+    # CHUNK_SIZE boards depth-first keeps the memory bounded.
+    def runNumpy(self):
+        import numpy
+
+        self.count = 0
+        assert self.width <= 64, "numpy engine supports a width up to 64"
+
+        columns = numpy.arange(self.width // 2 + self.width % 2, dtype=numpy.uint64)
+        bits = numpy.left_shift(numpy.uint64(1), columns)
+        # first queen in the left half has a mirrored solution in the right half
+        weights = numpy.where(2 * columns + 1 == self.width, 1, 2).astype(numpy.int64)
+
+        one = numpy.uint64(1)
+        self.count = self.expandNumpy(numpy, 1, bits, bits << one, bits >> one, weights)
+        return self.count
+
+    # counts the solutions for arrays of partial boards with given rows placed
+    def expandNumpy(self, numpy, row, cols, diag1, diag2, weights):
+        # all queens placed by the first row already (1x1 board)
+        if row == self.width:
+            return int(weights.sum())
+
+        full = numpy.uint64(self.allColumns)
+        one = numpy.uint64(1)
+        found = 0
+
+        for start in range(0, len(cols), CHUNK_SIZE):
+            chunk = slice(start, start + CHUNK_SIZE)
+            avail = full & ~(cols[chunk] | diag1[chunk] | diag2[chunk])
+
+            # last row has one free column at most
+            if row == self.lastRow:
+                found += int(weights[chunk][avail != 0].sum())
+                continue
+
+            children = []
+            for column in range(self.width):
+                bit = one << numpy.uint64(column)
+                selected = (avail & bit) != 0
+                if selected.any():
+                    children.append((cols[chunk][selected] | bit,
+                                     ((diag1[chunk][selected] | bit) << one) & full,
+                                     (diag2[chunk][selected] | bit) >> one,
+                                     weights[chunk][selected]))
+
+            if children:
+                found += self.expandNumpy(
+                    numpy, row + 1, *[numpy.concatenate(arrays) for arrays in zip(*children)])
+        return found
+
+    # constructs one solution without searching in O(n) (none for width 2
+    # and 3): the queens of the columns are placed in the even rows followed
+    # by the odd rows (1-based); for width % 6 == 2 the odd rows start with
+    # 3, 1 and end with 5, for width % 6 == 3 the even rows end with 2 and
+    # the odd rows end with 1, 3. Returns the solution or None.
+    def construct(self):
+        if self.width in (2, 3):
+            return None
+
+        evens = list(range(2, self.width + 1, 2))
+        odds = list(range(1, self.width + 1, 2))
+        if self.width % 6 == 2:
+            odds = [3, 1] + odds[3:] + [5]
+        elif self.width % 6 == 3:
+            evens = evens[1:] + [2]
+            odds = odds[2:] + [1, 3]
+
+        self.columns = [row - 1 for row in evens + odds]
+        solution = tuple(self.columns)
+        self.solutions.add(solution)
+        return solution
+
+    # checks in O(n) that a solution (row per column) places one queen per
+    # row and column without any two queens on the same diagonal.
+    @staticmethod
+    def isValid(solution):
+        width = len(solution)
+        rows = bytearray(width)
+        diagonals1 = bytearray(2 * width)
+        diagonals2 = bytearray(2 * width)
+        for column, row in enumerate(solution):
+            if not 0 <= row < width or rows[row] or \
+                    diagonals1[column + row] or diagonals2[width + column - row]:
+                return False
+            rows[row] = diagonals1[column + row] = diagonals2[width + column - row] = 1
+        return True
+
+    # adding current placement and its mirrored variants to the solutions
+    def addSolution(self):
+        solutionA = self.columns[0:]
+        self.solutions.add(tuple(solutionA))
+
+        # mirrored left <-> right
+        solutionB = tuple(reversed(solutionA))
+        self.solutions.add(solutionB)
+
+        # mirrored top <-> bottom
+        self.solutions.add(tuple(map(lambda n: self.lastRow - n, solutionA)))
+        # mirrored top <-> bottom and left <-> right
+        self.solutions.add(tuple(map(lambda n: self.lastRow - n, solutionB)))
 
     # printing all solutions where n queens are placed on a nxn board
     # without threaten another one.
     def printAllSolutions(self):
         for solution in sorted(self.solutions):
-            line = ""
-            for ix in range(len(solution)):
-                line += "(%d,%d)" % (ix+1, solution[ix]+1)
-            print(line)
+            print(Queen.formatSolution(solution))
+
+    # one solution as text line (column and row of each queen)
+    @staticmethod
+    def formatSolution(solution):
+        return "".join(["(%d,%d)" % (ix+1, value+1) for ix, value in enumerate(solution)
+                        if value >= 0])
+
+    # writing solutions in batches to an open file; the binary format is one
+    # byte per column with the row of the queen. Returns number of solutions.
+    @staticmethod
+    def writeSolutions(solutions, handle, binary=False):
+        count = 0
+        batch = []
+        for solution in solutions:
+            batch.append(bytes(solution) if binary else Queen.formatSolution(solution))
+            if len(batch) == BATCH_SIZE:
+                count += len(batch)
+                handle.write(b"".join(batch) if binary else "\n".join(batch) + "\n")
+                batch = []
+
+        if batch:
+            count += len(batch)
+            handle.write(b"".join(batch) if binary else "\n".join(batch) + "\n")
+        return count
+
+
+def parseSquare(text):
+    """Column and row (both 0-based) of a square given as 'column,row' (1-based)."""
+    import argparse
+
+    try:
+        column, row = [int(value) for value in text.split(",")]
+    except ValueError:
+        raise argparse.ArgumentTypeError("'%s' is not column,row" % text)
+    return column - 1, row - 1
+
+
+def generate(instance, options):
+    """Provides the solutions to stream: all of them or the first ones only."""
+    if options.constraints:
+        return instance.generateVariant(options.constraints)
+    if options.construct:
+        solution = instance.construct()
+        return [] if solution is None else [solution]
+    if options.first is not None or options.first_row is not None:
+        return instance.iterSolutions(options.first, None if options.first_row is None
+                                      else options.first_row - 1)
+    return instance.generateSolutions()
+
+
+def solve(instance, options, stdout=None):
+    """
+    Running the search selected by the options; returns number of solutions.
+    With output '-' the solutions are written to given stdout (default: sys.stdout).
+    """
+    if options.output == "-":
+        stdout = stdout or sys.stdout
+        handle = stdout.buffer if options.binary else stdout
+        instance.count = Queen.writeSolutions(
+            generate(instance, options), handle, options.binary)
+        handle.flush()
+    elif options.output:
+        with open(options.output, "wb" if options.binary else "w") as handle:
+            instance.count = Queen.writeSolutions(
+                generate(instance, options), handle, options.binary)
+    elif options.constraints and options.count:
+        instance.runVariant(options.constraints)
+    elif options.constraints or options.construct or \
+            options.first is not None or options.first_row is not None:
+        instance.solutions = set(generate(instance, options))
+    elif options.fundamental:
+        instance.runFundamental()
+    elif options.count:
+        if options.memo_rows > 0:
+            instance.runCountMemo(options.memo_rows, options.memo_size)
+        elif options.engine == "numpy":
+            instance.runNumpy()
+        elif options.engine == "bits":
+            instance.runCountBits()
+        else:
+            instance.runCount()
+    elif options.engine == "bits":
+        instance.runBits()
+    elif options.profile:
+        instance.runProfiled()
+    else:
+        instance.run()
+
+    if options.count or options.output or options.fundamental:
+        return instance.count
+    return len(instance.solutions)
+
+
+def printStatistics(name, samples):
+    """Printing min, median, mean, standard deviation and 95th percentile of durations (ns)."""
+    import math
+    import statistics
+
+    values = sorted(sample / 1e9 for sample in samples)
+    p95 = values[max(0, math.ceil(0.95 * len(values)) - 1)]
+    print("...%s: runs=%d, min=%f, median=%f, mean=%f, stddev=%f, p95=%f seconds." % (
+        name, len(values), values[0], statistics.median(values), statistics.mean(values),
+        statistics.pstdev(values), p95))
 
 
 def main():
     """Application entry point."""
-    width = 8  # default
-    if len(sys.argv) == 2:
-        width = int(sys.argv[1])
+    import argparse
+    import contextlib
+
+    parser = argparse.ArgumentParser(description="Queen algorithm.")
+    parser.add_argument("width", nargs="?", type=int, default=8,
+                        help="width (=height) of the board (default: 8)")
+    parser.add_argument("--engine", choices=ENGINES, default=ENGINES[0],
+                        help="search engine (default: %s); numpy counts only" % ENGINES[0])
+    parser.add_argument("--count", action="store_true",
+                        help="count the solutions only without storing them")
+    parser.add_argument("--fundamental", action="store_true",
+                        help="counting the solutions unique under rotation and reflection")
+    parser.add_argument("--output", metavar="FILE",
+                        help="streaming the solutions while searching (bits engine)"
+                             " to given file or '-' for stdout")
+    parser.add_argument("--binary", action="store_true",
+                        help="streaming one byte per column instead of text lines")
+    parser.add_argument("--warmup", type=int, default=0,
+                        help="number of runs before measuring (default: 0)")
+    parser.add_argument("--repeat", type=int, default=1,
+                        help="number of measured runs; '...took' is the median (default: 1)")
+    parser.add_argument("--profile", action="store_true",
+                        help="printing nodes and pruned columns per row and the time"
+                             " adding solutions as JSON (list engine only)")
+    parser.add_argument("--memo-rows", type=int, default=0, metavar="K",
+                        help="counting with a cache for the boards of the last K rows"
+                             " (bits engine, default: 0 = off)")
+    parser.add_argument("--memo-size", type=int, default=65536,
+                        help="maximum number of boards in that cache (default: 65536)")
+    parser.add_argument("--first", type=int, metavar="K",
+                        help="stopping the search after the first K solutions")
+    parser.add_argument("--first-row", type=int, metavar="COLUMN",
+                        help="searching the solutions with the first row queen"
+                             " in given column (1-based) only")
+    parser.add_argument("--construct", action="store_true",
+                        help="constructing one solution without searching (any width)")
+    parser.add_argument("--rows", type=int, metavar="HEIGHT",
+                        help="height of the board with one queen per row (default: width)")
+    parser.add_argument("--blocked", type=parseSquare, action="append", default=[],
+                        metavar="COLUMN,ROW", help="square without queen (repeatable)")
+    parser.add_argument("--placed", type=parseSquare, action="append", default=[],
+                        metavar="COLUMN,ROW", help="queen placed in advance (repeatable)")
+    parser.add_argument("--super", action="store_true",
+                        help="super queens moving like a knight as well")
+    options = parser.parse_args()
+    if options.count and options.output:
+        parser.error("--count can't be used with --output")
+    options.constraints = None
+    if options.rows is not None or options.blocked or options.placed or options.super:
+        try:
+            options.constraints = Constraints(options.width, options.rows, options.blocked,
+                                              options.placed, options.super)
+        except ValueError as exception:
+            parser.error(str(exception))
+        if options.engine != "list" or options.fundamental or options.profile or \
+                options.memo_rows > 0 or options.construct or options.first is not None or \
+                options.first_row is not None:
+            parser.error("--rows, --blocked, --placed and --super are not supported with"
+                         " --engine, --fundamental, --profile, --memo-rows, --construct,"
+                         " --first or --first-row")
+        if options.binary and options.constraints.height < options.width:
+            # columns without queen can't be written as one byte per column
+            parser.error("--binary can't be used with less --rows than the width")
+        if options.constraints.isPlain():
+            options.constraints = None
+    if options.memo_rows > 0:
+        if options.engine == "list":
+            options.engine = "bits"
+        if options.engine != "bits":
+            parser.error("--memo-rows is supported for the bits engine only")
+        # the cache is for counting only
+        options.count = True
+    if options.engine == "numpy":
+        try:
+            import numpy  # pylint: disable=W0611
+        except ImportError:
+            parser.error("the numpy engine requires the numpy package")
+        if options.width > 64:
+            # bitboards are arrays of 64 bit integers
+            parser.error("the numpy engine supports widths up to 64")
+        # breadth-first search does count only
+        options.count = True
+    if options.repeat < 1 or options.warmup < 0:
+        parser.error("--repeat must be at least 1 and --warmup must not be negative")
+    if options.output and (options.repeat > 1 or options.warmup > 0):
+        # each run would write all solutions again
+        parser.error("--warmup and --repeat can't be used with --output")
+    if options.profile and (options.engine != "list" or options.count or
+                            options.fundamental or options.output):
+        parser.error("--profile is supported for the list engine storing the solutions only")
+    if options.fundamental and (options.output or options.engine == "numpy" or
+                                options.memo_rows > 0):
+        parser.error("--fundamental can't be used with --output, --engine numpy or --memo-rows")
+    if (options.first is not None or options.first_row is not None) and \
+            (options.engine != "list" or options.count or options.fundamental or options.profile):
+        parser.error("--first and --first-row are not supported with --engine, --count,"
+                     " --fundamental or --profile")
+    if options.first is not None and options.first < 1:
+        parser.error("--first must be at least 1")
+    if options.first_row is not None and not 1 <= options.first_row <= options.width:
+        parser.error("--first-row must be 1..%d" % options.width)
+    if options.construct and (options.engine != "list" or options.count or options.fundamental or
+                              options.profile or options.first is not None or
+                              options.first_row is not None):
+        parser.error("--construct is not supported with --engine, --count, --fundamental,"
+                     " --profile, --first or --first-row")
+    if options.binary and options.width > 256:
+        parser.error("--binary supports widths up to 256 (one byte per column)")
+
+    if options.output == "-":
+        # the solutions only on stdout, the status lines on stderr
+        stdout = sys.stdout
+        with contextlib.redirect_stdout(sys.stderr):
+            measure(options, stdout)
+    else:
+        measure(options)
+
+
+def measure(options, stdout=None):
+    """Searching (repeatedly when requested) and printing the results."""
+    import json
+    import statistics
+
+    instance = Queen(options.width)
+    print("Running %s with %s - version %s" % \
+          (sys.argv[0], sys.executable, sys.version))
+    print("Queen raster (%dx%d)" % (instance.width, options.constraints.height
+                                    if options.constraints else instance.width))
+
+    for _ in range(options.warmup):
+        solve(Queen(options.width), options, stdout)
+
+    wall = []
+    cpu = []
+    for _ in range(options.repeat):
+        instance = Queen(options.width)
+        start, startCpu = time.perf_counter_ns(), time.process_time_ns()
+        found = solve(instance, options, stdout)
+        wall.append(time.perf_counter_ns() - start)
+        cpu.append(time.process_time_ns() - startCpu)
+
+    print("...took %f seconds." % (statistics.median(wall) / 1e9))
+    print("...%d solutions found." % found)
+
+    if options.fundamental:
+        print("...%d unique solutions found." % instance.unique)
+
+    if options.constraints:
+        print("...variant=%s" % options.constraints.describe())
+
+    if options.first is not None or options.first_row is not None:
+        # not all solutions searched, the number is not comparable
+        print("...limited=%s" % ", ".join(
+            "%s=%d" % (name, value) for name, value in [("first", options.first),
+                                                        ("first-row", options.first_row)]
+            if value is not None))
+
+    if options.construct and found:
+        start = time.perf_counter_ns()
+        valid = Queen.isValid(next(iter(instance.solutions)))
+        print("...solution %s (checked in %f seconds)." % (
+            "valid" if valid else "INVALID", (time.perf_counter_ns() - start) / 1e9))
+
+    if options.repeat > 1 or options.warmup > 0:
+        printStatistics("wall time", wall)
+        printStatistics("cpu time", cpu)
+
+    if instance.cacheInfo is not None:
+        lookups = instance.cacheInfo.hits + instance.cacheInfo.misses
+        print("...cache: hits=%d, misses=%d, hit ratio=%f, size=%d of %d." % (
+            instance.cacheInfo.hits, instance.cacheInfo.misses,
+            instance.cacheInfo.hits / lookups if lookups else 0.0,
+            instance.cacheInfo.currsize, instance.cacheInfo.maxsize))
+
+    if options.profile:
+        print("...profile=%s" % json.dumps(instance.profile, sort_keys=True))
+
+    if OUTPUT and not (options.count or options.output or options.fundamental):
+        instance.printAllSolutions()
+
 
+def quickMain(width):
+    """
+    Entry point for searching the solutions of one width without options;
+    same output as main() but without importing argparse and statistics.
+    """
     instance = Queen(width)
     print("Running %s with %s - version %s" % \
           (sys.argv[0], sys.executable, sys.version))
     print("Queen raster (%dx%d)" % (instance.width, instance.width))
 
-    Start = time.time()
+    start = time.perf_counter_ns()
     instance.run()
-    print("...took %f seconds." % (time.time() - Start))
-    print("...%d solutions found." % (len(instance.solutions)))
+    print("...took %f seconds." % ((time.perf_counter_ns() - start) / 1e9))
+    print("...%d solutions found." % len(instance.solutions))
 
     if OUTPUT:
         instance.printAllSolutions()
 
 if __name__ == '__main__':
-    main()
+    if len(sys.argv) == 1 or len(sys.argv) == 2 and sys.argv[1].isdigit():
+        quickMain(int(sys.argv[1]) if len(sys.argv) == 2 else 8)
+    else:
+        main()
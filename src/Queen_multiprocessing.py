@@ -21,12 +21,29 @@
 # OUT OF OR IN CONNECTION WITH THE SOFTWARE OR THE USE OR OTHER DEALINGS IN THE SOFTWARE.
 """
 # pylint: disable=E0602,C0325
+import os
 import sys
+import json
+import math
+import mmap
 import time
+import queue
+import socket
+import shutil
+import base64
+import argparse
+import threading
+import tempfile
+import statistics
+import collections
 import multiprocessing
-from contextlib import closing
+import concurrent.futures
+from contextlib import closing, redirect_stdout
+from multiprocessing.managers import BaseManager
 
 OUTPUT = False    # enable/disable of printing the solutions
+BATCH_SIZE = 4096  # number of solutions written at once when streaming them
+POLL_INTERVAL = 0.1  # seconds between asking the coordinator for tasks (remote workers)
 
 
 class Queen(object):
@@ -41,29 +58,67 @@ class Queen(object):
         number_of_diagonals = 2 * self.width - 1
         self.diagonals1 = number_of_diagonals * [0]
         self.diagonals2 = number_of_diagonals * [0]
-        # list of solutions
-        self.solutions = set()
+        # packed solutions (one byte per column with the row of the queen)
+        self.packed = bytearray()
+        # whether packed solutions get their left <-> right mirror added
+        self.mirror = True
 
-    def run(self, column):
+    def place(self, prefix):
         """
-        Starts the search with initial parameters and organizing
-        to search the half only
+        Occupying columns and diagonals for the queens of the first rows.
+        The prefix provides the column for each of those rows.
         """
-        ix_diag1 = column
-        ix_diag2 = self.last_row + column
-        # occupying column and diagonals depending on current row and column
-        self.columns[column] = 0
-        self.diagonals1[ix_diag1] = 1
-        self.diagonals2[ix_diag2] = 1
+        for row, column in enumerate(prefix):
+            self.columns[column] = row
+            self.diagonals1[row + column] = 1
+            self.diagonals2[self.last_row - row + column] = 1
 
-        self.calculate(1, [k for k in range(self.width) if not k == column])
+    def free(self, prefix):
+        """Freeing columns and diagonals occupied by place()."""
+        for row, column in enumerate(prefix):
+            self.diagonals1[row + column] = 0
+            self.diagonals2[self.last_row - row + column] = 0
 
-        # Freeing column and diagonals depending on current row and column
-        self.diagonals1[ix_diag1] = 0
-        self.diagonals2[ix_diag2] = 0
+    def run_packed(self, prefix):
+        """
+        Starts the search with the queens of the first rows placed as given
+        by the prefix (first queen in the left half to search the half only),
+        appending each solution as one byte per column to a buffer.
+        The left <-> right mirror is added unless the first queen is in
+        the middle column (then the mirror is found by the search itself), so
+        no solution is produced twice, not even across different prefixes.
+        """
+        self.packed = bytearray()
+        self.mirror = 2 * prefix[0] + 1 != self.width
+        self.place(prefix)
+        if len(prefix) == self.width:
+            # all queens placed by the prefix (1x1 board)
+            self.packed += bytes(self.columns)
+        else:
+            self.calculate_packed(len(prefix), [k for k in range(self.width) if k not in prefix])
+        self.free(prefix)
+        return bytes(self.packed)
 
-    def calculate(self, row, column_range):
-        """searches for all possible solutions."""
+    def count(self, prefix):
+        """
+        Counts all solutions for given prefix without storing them. A first
+        queen in the left half has a mirrored solution in the right half;
+        the middle column (odd width) is counted once.
+        """
+        factor = 1 if 2 * prefix[0] + 1 == self.width else 2
+        self.place(prefix)
+        if len(prefix) == self.width:
+            # all queens placed by the prefix (1x1 board)
+            found = 1
+        else:
+            found = self.calculate_count(
+                len(prefix), [k for k in range(self.width) if k not in prefix])
+        self.free(prefix)
+        return factor * found
+
+    def calculate_count(self, row, column_range):
+        """counts all possible solutions without storing them."""
+        found = 0
         for column in column_range:
             # relating diagonale '\' depending on current row and column
             ix_diag1 = row + column
@@ -78,34 +133,68 @@ class Queen(object):
             if self.diagonals2[ix_diag2] == 1:
                 continue
 
-            # occupying column and diagonals depending on current row and column
-            self.columns[column] = row
+            # all queens have been placed?
+            if row == self.last_row:
+                found += 1
+                continue
+
+            # occupying diagonals depending on current row and column
             self.diagonals1[ix_diag1] = 1
             self.diagonals2[ix_diag2] = 1
 
+            # trying to place next queen...
+            found += self.calculate_count(row + 1, [k for k in column_range if k != column])
+
+            # Freeing diagonals depending on current row and column
+            self.diagonals1[ix_diag1] = 0
+            self.diagonals2[ix_diag2] = 0
+        return found
+
+    def calculate_packed(self, row, column_range):
+        """searches for all possible solutions appending them to the packed buffer."""
+        for column in column_range:
+            # relating diagonale '\' depending on current row and column
+            ix_diag1 = row + column
+
+            if self.diagonals1[ix_diag1] == 1:
+                continue
+
+            # relating diagonale '/' depending on current row and column
+            ix_diag2 = self.last_row - row + column
+
+            # is one of the relating diagonals OCCUPIED by a queen?
+            if self.diagonals2[ix_diag2] == 1:
+                continue
+
+            self.columns[column] = row
+
             # all queens have been placed?
             if row == self.last_row:
-                solution_a = self.columns[0:]
-                self.solutions.add(tuple(solution_a))
-
-                # mirrored left <-> right
-                solution_b = tuple(reversed(solution_a))
-                self.solutions.add(solution_b)
-
-                # mirrored top <-> bottom
-                self.solutions.add(tuple(
-                    map(lambda n: self.last_row - n, solution_a)))
-                # mirrored top <-> bottom and left <-> right
-                self.solutions.add(tuple(
-                    map(lambda n: self.last_row - n, solution_b)))
-            else:
-                # trying to place next queen...
-                self.calculate(row + 1, [k for k in column_range if k != column])
-
-            # Freeing column and diagonals depending on current row and column
+                solution = bytes(self.columns)
+                self.packed += solution
+                if self.mirror:
+                    # mirrored left <-> right
+                    self.packed += solution[::-1]
+                continue
+
+            # occupying diagonals depending on current row and column
+            self.diagonals1[ix_diag1] = 1
+            self.diagonals2[ix_diag2] = 1
+
+            # trying to place next queen...
+            self.calculate_packed(row + 1, [k for k in column_range if k != column])
+
+            # Freeing diagonals depending on current row and column
             self.diagonals1[ix_diag1] = 0
             self.diagonals2[ix_diag2] = 0
 
+    @staticmethod
+    def unpack_solutions(buffers, width):
+        """Provides the solutions of packed buffers as tuples."""
+        for buffer in buffers:
+            for offset in range(0, len(buffer), width):
+                yield tuple(buffer[offset:offset + width])
+
     @staticmethod
     def print_all_solutions(solutions):
         """
@@ -113,44 +202,609 @@ class Queen(object):
         without threaten another one.
         """
         for solution in sorted(solutions):
-            line = ""
-            for idx, value in enumerate(solution):
-                line += "(%d,%d)" % (idx+1, value+1)
-            print(line)
+            print(Queen.format_solution(solution))
+
+    @staticmethod
+    def format_solution(solution):
+        """One solution as text line (column and row of each queen)."""
+        return "".join(["(%d,%d)" % (idx+1, value+1) for idx, value in enumerate(solution)])
+
+    @staticmethod
+    def write_solutions(buffer, width, handle, binary=False):
+        """
+        Writing packed solutions to an open file; in binary format the buffer
+        is written as it is, otherwise as text lines in batches.
+        """
+        if binary:
+            handle.write(buffer)
+            return
+
+        batch = []
+        for solution in Queen.unpack_solutions([buffer], width):
+            batch.append(Queen.format_solution(solution))
+            if len(batch) == BATCH_SIZE:
+                handle.write("\n".join(batch) + "\n")
+                batch = []
+
+        if batch:
+            handle.write("\n".join(batch) + "\n")
+
+
+class Checkpoint(object):
+    """
+    Results of finished tasks saved to a file (one JSON line per task) to
+    skip those tasks when an interrupted run is started again.
+    """
+
+    def __init__(self, path, width, depth, count_only):
+        self.path = path
+        self.count_only = count_only
+        # records of other configurations in the same file are ignored
+        self.key = {'width': width, 'depth': depth, 'count': count_only}
+        self.handle = None
+
+    def load(self):
+        """Provides the results of the finished tasks by prefix."""
+        results = {}
+        if not os.path.isfile(self.path):
+            return results
+
+        with open(self.path) as handle:
+            for line in handle:
+                try:
+                    record = json.loads(line)
+                except ValueError:
+                    # last line of an interrupted run might be incomplete
+                    continue
+                if any(record.get(key) != value for key, value in self.key.items()):
+                    continue
+                result = record['result']
+                if not self.count_only:
+                    result = base64.b64decode(result)
+                results[tuple(record['prefix'])] = result
+        return results
+
+    def save(self, prefix, result):
+        """Appending the result of a finished task to the file."""
+        if self.handle is None:
+            self.handle = open(self.path, 'a+')
+            # starting on a new line when last line is incomplete
+            if self.handle.tell() > 0:
+                self.handle.seek(self.handle.tell() - 1)
+                if self.handle.read(1) != '\n':
+                    self.handle.write('\n')
+
+        record = dict(self.key)
+        record['prefix'] = list(prefix)
+        record['result'] = result if self.count_only else base64.b64encode(result).decode()
+        self.handle.write(json.dumps(record) + '\n')
+        self.handle.flush()
+        os.fsync(self.handle.fileno())
+
+    def close(self):
+        """Closing the file."""
+        if self.handle is not None:
+            self.handle.close()
+            self.handle = None
+
+
+class Coordinator(object):
+    """
+    Queue of tasks shared with remote workers (see --serve and --connect).
+    Each task handed out is remembered with its worker; when a worker has
+    not been seen for the timeout its tasks are queued again. Only the first
+    result of a task is taken.
+    """
+
+    def __init__(self, timeout):
+        self.lock = threading.Lock()
+        self.timeout = timeout
+        self.pending = collections.deque()
+        # task -> worker id
+        self.running = {}
+        # worker id -> time last seen
+        self.seen = {}
+        self.results = queue.Queue()
+        self.done = False
+
+    def submit(self, tasks):
+        """Adding tasks to the queue."""
+        with self.lock:
+            self.pending.extend(tasks)
+
+    def get_task(self, worker_id):
+        """Next task for given worker or None when there is none."""
+        with self.lock:
+            self.seen[worker_id] = time.time()
+            self.requeue()
+            if not self.pending:
+                return None
+            task = self.pending.popleft()
+            self.running[task] = worker_id
+            return task
+
+    def put_result(self, worker_id, task, result):
+        """Result of a task (as provided by worker())."""
+        with self.lock:
+            self.seen[worker_id] = time.time()
+            if self.running.pop(task, None) is not None:
+                self.results.put(result)
+
+    def heartbeat(self, worker_id):
+        """Telling that given worker is still alive."""
+        with self.lock:
+            self.seen[worker_id] = time.time()
+
+    def is_done(self):
+        """True when the workers should stop."""
+        return self.done
+
+    def requeue(self):
+        """Queuing the tasks of workers not seen for the timeout again (lock held)."""
+        now = time.time()
+        for task, worker_id in list(self.running.items()):
+            if now - self.seen.get(worker_id, 0) > self.timeout:
+                del self.running[task]
+                self.pending.appendleft(task)
+
+
+class QueenManager(BaseManager):
+    """Manager providing the coordinator to the remote workers."""
+
+
+class DistributedPool(object):
+    """
+    Replacement for multiprocessing.Pool in search(): the tasks are
+    published to remote workers connecting to given address.
+    """
+
+    def __init__(self, address, authkey, timeout):
+        self.coordinator = Coordinator(timeout)
+        QueenManager.register('get_coordinator', callable=lambda: self.coordinator)
+        self.server = QueenManager(address=address, authkey=authkey).get_server()
+        thread = threading.Thread(target=self.server.serve_forever)
+        thread.daemon = True
+        thread.start()
+
+    def imap_unordered(self, func, tasks, chunksize=1):
+        """Results of the tasks as they are finishing (func must be worker)."""
+        assert func is worker and chunksize > 0
+        self.coordinator.submit(tasks)
+        for _ in range(len(tasks)):
+            while True:
+                try:
+                    yield self.coordinator.results.get(timeout=self.coordinator.timeout)
+                    break
+                except queue.Empty:
+                    # all workers gone? then a new one gets the queued tasks again
+                    with self.coordinator.lock:
+                        self.coordinator.requeue()
+
+    def close(self):
+        """Telling the workers to stop."""
+        self.coordinator.done = True
+        # giving the polling workers the chance to notice
+        time.sleep(2 * POLL_INTERVAL)
+
+    def terminate(self):
+        """Same as close()."""
+        self.close()
+
+
+class ThreadPool(object):
+    """
+    Replacement for multiprocessing.Pool in search() running the tasks in
+    threads (useful for free-threaded Python only); each task has its own
+    Queen instance and returns its result, so nothing is shared or locked.
+    """
+
+    def __init__(self, processes):
+        self.executor = concurrent.futures.ThreadPoolExecutor(max_workers=processes)
+
+    def map(self, func, tasks, chunksize=1):  # pylint: disable=W0613
+        """Results of the tasks in order."""
+        return list(self.executor.map(func, tasks))
+
+    def imap_unordered(self, func, tasks, chunksize=1):  # pylint: disable=W0613
+        """Results of the tasks as they are finishing."""
+        futures = [self.executor.submit(func, task) for task in tasks]
+        for future in concurrent.futures.as_completed(futures):
+            yield future.result()
+
+    def close(self):
+        """Waiting for the running tasks."""
+        self.executor.shutdown(wait=True)
+
+    def terminate(self):
+        """Cancelling the tasks not started yet."""
+        self.executor.shutdown(wait=False, cancel_futures=True)
+
+
+def is_gil_enabled():
+    """Whether the interpreter has a global interpreter lock (always before 3.13)."""
+    return getattr(sys, "_is_gil_enabled", lambda: True)()
+
+
+def remote_worker(address, authkey, timeout):
+    """Running tasks of a coordinator until it is done or not reachable anymore."""
+    QueenManager.register('get_coordinator')
+    manager = QueenManager(address=address, authkey=authkey)
+    deadline = time.time() + timeout
+    while True:
+        try:
+            manager.connect()
+            break
+        except ConnectionRefusedError:
+            # coordinator not started yet
+            if time.time() > deadline:
+                return
+            time.sleep(POLL_INTERVAL)
+
+    try:
+        coordinator = manager.get_coordinator()
+    except (EOFError, OSError):
+        # coordinator finished in the meantime
+        return
+    worker_id = "%s:%d" % (socket.gethostname(), os.getpid())
+    stop = threading.Event()
+
+    def heartbeat():
+        """Telling the coordinator regularly that this worker is alive."""
+        while not stop.wait(timeout / 3.0):
+            try:
+                coordinator.heartbeat(worker_id)
+            except (EOFError, OSError):
+                return
+
+    thread = threading.Thread(target=heartbeat)
+    thread.daemon = True
+    thread.start()
+
+    try:
+        while True:
+            task = coordinator.get_task(worker_id)
+            if task is None:
+                if coordinator.is_done():
+                    break
+                time.sleep(POLL_INTERVAL)
+                continue
+            coordinator.put_result(worker_id, task, worker(task))
+    except (EOFError, OSError):
+        # coordinator has finished (or is gone)
+        pass
+    stop.set()
+
+
+def parse_address(text):
+    """Host and port of 'host:port'."""
+    host, _, port = text.rpartition(':')
+    return (host or 'localhost', int(port))
+
+
+def create_prefixes(width, depth):
+    """
+    Provides all valid placements of the queens in the first rows (depth)
+    with the first queen in the left half of the board; each one is a task.
+    """
+    prefixes = [(column,) for column in range(width // 2 + width % 2)]
+    for row in range(1, depth):
+        prefixes = [prefix + (column,) for prefix in prefixes
+                    for column in range(width)
+                    if all(column != other and abs(column - other) != row - ix
+                           for ix, other in enumerate(prefix))]
+    return prefixes
+
+
+def store_packed(scratch, buffer):
+    """
+    Appending packed solutions to the scratch file of this process (thread);
+    returns file name, offset and length to read them from there.
+    """
+    name = "%d.bin" % threading.get_native_id()
+    with open(os.path.join(scratch, name), "ab") as handle:
+        offset = handle.tell()
+        handle.write(buffer)
+    return (name, offset, len(buffer))
+
+
+def load_packed(scratch, reference):
+    """Packed solutions stored by store_packed() for given file name, offset and length."""
+    name, offset, length = reference
+    with open(os.path.join(scratch, name), "rb") as handle:
+        handle.seek(offset)
+        return handle.read(length)
 
 
 def worker(data):
     """Thread function."""
-    width, column = data
+    width, prefix, count_only, scratch = data
+    # cpu time of this thread only (the other threads of --threads are busy as well)
+    start, start_cpu = time.perf_counter(), time.thread_time()
     queen = Queen(width)
-    queen.run(column)
-    return queen.solutions
+    if count_only:
+        result = queen.count(prefix)
+    else:
+        result = queen.run_packed(prefix)
+        if scratch and result:
+            # only offset and length are sent back instead of the solutions
+            result = store_packed(scratch, result)
+    # native id of the main thread is the process id (per thread with --threads)
+    return (prefix, result, time.perf_counter() - start,
+            time.thread_time() - start_cpu, threading.get_native_id())
+
+
+def print_task_timing(timing):
+    """Printing duration of each task and a summary to see load imbalance."""
+    for prefix, duration in sorted(timing):
+        print("...task %s took %f seconds." % (prefix, duration))
+
+    durations = [duration for _, duration in timing]
+    print("...%d tasks, min=%f, avg=%f, max=%f seconds." % (
+        len(durations), min(durations), sum(durations) / len(durations), max(durations)))
+
+
+def print_statistics(name, samples):
+    """Printing min, median, mean, standard deviation and 95th percentile of durations (ns)."""
+    values = sorted(sample / 1e9 for sample in samples)
+    p95 = values[max(0, math.ceil(0.95 * len(values)) - 1)]
+    print("...%s: runs=%d, min=%f, median=%f, mean=%f, stddev=%f, p95=%f seconds." % (
+        name, len(values), values[0], statistics.median(values), statistics.mean(values),
+        statistics.pstdev(values), p95))
+
+
+def get_profile(result):
+    """Number of tasks, busy and idle time (seconds) per worker process of one search."""
+    wall = result['wall'] / 1e9
+    return {
+        'wall': wall,
+        'workers': {str(pid): {'tasks': tasks, 'busy': busy, 'idle': max(0.0, wall - busy)}
+                    for pid, (tasks, busy) in sorted(result['busy'].items())}
+    }
+
+
+def warm_up(_):
+    """Does nothing; used to start all processes of the pool in advance."""
+    return os.getpid()
+
+
+def search(pool, width, options, handle, start_ns):
+    """
+    Searching the solutions for one width using given pool; the wall time is
+    measured from given start, the cpu time is the one of this process and of
+    all tasks running elsewhere (threads of --threads are part of this process).
+    """
+    depth = max(1, min(options.depth, width - 1))
+    start_cpu = time.process_time_ns()
+    result = {'count': 0, 'buffers': [], 'timing': [], 'cpu': 0, 'restored': 0, 'tasks': 0,
+              'busy': {}}
+
+    checkpoint = None
+    restored = {}
+    if options.checkpoint:
+        checkpoint = Checkpoint(options.checkpoint, width, depth, options.count)
+        restored = checkpoint.load()
+
+    # own directory per search (workers keep writing to the files by name)
+    scratch = None
+    if options.scratch and not options.count:
+        scratch = tempfile.mkdtemp(prefix="queen-%d-" % width, dir=options.scratch)
+
+    def collect(results):
+        """Adding the results of one task."""
+        if options.count:
+            return results
+        if isinstance(results, tuple):
+            # solutions in the scratch files are written or kept at the end
+            return results[2] // width
+        if handle:
+            Queen.write_solutions(results, width, handle, options.binary)
+        elif OUTPUT:
+            result['buffers'].append(results)
+        return len(results) // width
+
+    tasks = []
+    for prefix in create_prefixes(width, depth):
+        if prefix in restored:
+            result['count'] += collect(restored[prefix])
+        else:
+            tasks.append((width, prefix, options.count, scratch))
+
+    for prefix, results, duration, cpu, pid in pool.imap_unordered(
+            worker, tasks, chunksize=max(1, options.chunksize)):
+        result['timing'].append((prefix, duration))
+        tasks_done, busy = result['busy'].get(pid, (0, 0.0))
+        result['busy'][pid] = (tasks_done + 1, busy + duration)
+        if not isinstance(pool, ThreadPool):
+            result['cpu'] += int(cpu * 1e9)
+        if checkpoint:
+            checkpoint.save(prefix, load_packed(scratch, results)
+                            if isinstance(results, tuple) else results)
+        result['count'] += collect(results)
+
+    if checkpoint:
+        checkpoint.close()
+
+    if scratch:
+        for name in sorted(os.listdir(scratch)):
+            with open(os.path.join(scratch, name), "rb") as source, \
+                    mmap.mmap(source.fileno(), 0, access=mmap.ACCESS_READ) as buffer:
+                if handle:
+                    Queen.write_solutions(buffer, width, handle, options.binary)
+                elif OUTPUT:
+                    result['buffers'].append(bytes(buffer))
+        shutil.rmtree(scratch)
+
+    if handle:
+        handle.flush()
+
+    result['wall'] = time.perf_counter_ns() - start_ns
+    result['cpu'] += time.process_time_ns() - start_cpu
+    result['restored'] = len(restored)
+    result['tasks'] = len(restored) + len(tasks)
+    return result
+
+
+def solve(pool, width, options, handle, start_ns=None):
+    """
+    Searching the solutions for one width (repeatedly when requested) and
+    printing the results; the duration of the first run is measured from
+    given start (default: now).
+    """
+    print("Queen raster (%dx%d)" % (width, width))
+
+    for _ in range(options.warmup):
+        search(pool, width, options, handle, time.perf_counter_ns())
+
+    results = []
+    for _ in range(options.repeat):
+        results.append(search(pool, width, options, handle, start_ns or time.perf_counter_ns()))
+        start_ns = None
+    result = results[-1]
+
+    print("...took %f seconds." % (statistics.median([r['wall'] for r in results]) / 1e9))
+    print("...%d solutions found." % result['count'])
+
+    if options.checkpoint:
+        print("...%d of %d tasks restored from checkpoint." % (result['restored'], result['tasks']))
+
+    if options.task_timing and result['timing']:
+        print_task_timing(result['timing'])
+
+    if options.repeat > 1 or options.warmup > 0:
+        print_statistics("wall time", [r['wall'] for r in results])
+        print_statistics("cpu time", [r['cpu'] for r in results])
+
+    if options.profile:
+        print("...profile=%s" % json.dumps(get_profile(result), sort_keys=True))
+
+    if OUTPUT and not options.count:
+        Queen.print_all_solutions(Queen.unpack_solutions(result['buffers'], width))
+
 
 def main():
     """Application entry point."""
-    width = 8  # default
-    if len(sys.argv) == 2:
-        width = int(sys.argv[1])
+    parser = argparse.ArgumentParser(description="Queen algorithm (multiprocessing).")
+    parser.add_argument("width", nargs="?", type=int, default=8,
+                        help="width (=height) of the board (default: 8)")
+    parser.add_argument("--to", type=int, metavar="WIDTH",
+                        help="solving all widths up to given one with the same (warm) pool")
+    parser.add_argument("--count", action="store_true",
+                        help="count the solutions only without storing them")
+    parser.add_argument("--depth", type=int, default=1,
+                        help="number of first rows placed per task (default: 1)")
+    parser.add_argument("--chunksize", type=int, default=1,
+                        help="number of tasks sent to a worker at once (default: 1)")
+    parser.add_argument("--task-timing", action="store_true",
+                        help="printing the duration of each task")
+    parser.add_argument("--output", metavar="FILE",
+                        help="streaming the solutions to given file or '-' for stdout"
+                             " while the tasks are finishing")
+    parser.add_argument("--binary", action="store_true",
+                        help="streaming one byte per column instead of text lines")
+    parser.add_argument("--scratch", metavar="DIR",
+                        help="workers appending the solutions to files in given directory"
+                             " and sending back offsets and lengths only")
+    parser.add_argument("--checkpoint", metavar="FILE",
+                        help="saving each finished task to given file and skipping"
+                             " the tasks already found there")
+    parser.add_argument("--warmup", type=int, default=0,
+                        help="number of runs per width before measuring (default: 0)")
+    parser.add_argument("--repeat", type=int, default=1,
+                        help="number of measured runs per width; '...took' is the median"
+                             " (default: 1)")
+    parser.add_argument("--profile", action="store_true",
+                        help="printing tasks, busy and idle time per worker process as JSON")
+    parser.add_argument("--threads", action="store_true",
+                        help="using threads instead of processes when the interpreter"
+                             " is free-threaded (processes otherwise)")
+    parser.add_argument("--serve", metavar="HOST:PORT",
+                        help="publishing the tasks to remote workers instead of a local pool")
+    parser.add_argument("--connect", metavar="HOST:PORT",
+                        help="running tasks of the coordinator at given address (worker mode)")
+    parser.add_argument("--workers", type=int, default=multiprocessing.cpu_count(),
+                        help="number of worker processes with --connect (default: all cores)")
+    parser.add_argument("--authkey", default=os.environ.get("QUEEN_AUTHKEY"),
+                        help="shared secret of coordinator and workers, required with --serve"
+                             " and --connect (default: environment variable QUEEN_AUTHKEY)")
+    parser.add_argument("--timeout", type=float, default=10.0,
+                        help="seconds after which the tasks of a silent worker are queued"
+                             " again (default: 10)")
+    options = parser.parse_args()
+    benchmark = options.repeat > 1 or options.warmup > 0
+    if options.repeat < 1 or options.warmup < 0:
+        parser.error("--repeat must be at least 1 and --warmup must not be negative")
+    if benchmark and (options.output or options.checkpoint):
+        parser.error("--warmup and --repeat can't be used with --output or --checkpoint")
+    if options.count and options.output:
+        parser.error("--count can't be used with --output")
+    if options.scratch and (options.count or options.serve):
+        parser.error("--scratch can't be used with --count or --serve")
+    if (options.serve or options.connect) and not options.authkey:
+        # the manager exchanges pickles, the secret is all that protects them
+        parser.error("--serve and --connect require --authkey or QUEEN_AUTHKEY")
+    if options.threads and (options.serve or options.connect):
+        parser.error("--threads can't be used with --serve or --connect")
+    if options.scratch and not os.path.isdir(options.scratch):
+        parser.error("--scratch directory %s does not exist" % options.scratch)
+    widths = range(options.width, max(options.width, options.to or 0) + 1)
+
+    if options.connect:
+        workers = [multiprocessing.Process(
+            target=remote_worker,
+            args=(parse_address(options.connect), options.authkey.encode(), options.timeout))
+                   for _ in range(max(1, options.workers))]
+        for process in workers:
+            process.start()
+        for process in workers:
+            process.join()
+        return
+
+    if options.output == "-":
+        # the solutions only on stdout, the status lines on stderr
+        handle = sys.stdout.buffer if options.binary else sys.stdout
+        with redirect_stdout(sys.stderr):
+            solve_all(options, widths, handle)
+    elif options.output:
+        with open(options.output, "wb" if options.binary else "w") as handle:
+            solve_all(options, widths, handle)
+    else:
+        solve_all(options, widths, None)
 
+
+def solve_all(options, widths, handle):
+    """Searching the solutions of all widths with one pool and printing the results."""
+    benchmark = options.repeat > 1 or options.warmup > 0
     print("Running %s with %s - version %s" % \
           (sys.argv[0], sys.executable, sys.version))
-    print("Queen raster (%dx%d)" % (width, width))
 
-    start = time.time()
+    start_ns = time.perf_counter_ns()
+    processes = multiprocessing.cpu_count()
+    if options.serve:
+        pool = DistributedPool(parse_address(options.serve), options.authkey.encode(),
+                               options.timeout)
+        print("...pool=remote")
+    elif options.threads and not is_gil_enabled():
+        pool = ThreadPool(processes)
+        print("...pool=threads, workers=%d" % processes)
+    else:
+        pool = multiprocessing.Pool(processes)
+        print("...pool=processes, workers=%d%s" % (
+            processes, " (GIL enabled, no threads)" if options.threads else ""))
 
-    column_range = range(width // 2 + width % 2)
-    solutions = set()
-    with closing(multiprocessing.Pool(multiprocessing.cpu_count())) as pool:
-        for results in pool.map(worker, [(width, column) for column in column_range]):
-            for solution in results:
-                solutions.add(solution)
+    with closing(pool):
+        if options.serve:
+            for width in widths:
+                solve(pool, width, options, handle)
+        elif options.to or benchmark:
+            # starting all processes before measuring the first width
+            pool.map(warm_up, range(processes), chunksize=1)
+            print("...pool startup took %f seconds." % ((time.perf_counter_ns() - start_ns) / 1e9))
+            for width in widths:
+                solve(pool, width, options, handle)
+        else:
+            # single width includes creating the pool as it always did
+            solve(pool, options.width, options, handle, start_ns)
         pool.terminate()
 
-    print("...took %f seconds." % (time.time() - start))
-    print("...%d solutions found." % (len(solutions)))
-
-    if OUTPUT:
-        Queen.print_all_solutions(solutions)
-
 if __name__ == '__main__':
     main()
@@ -0,0 +1,142 @@
+""" Validator for solution dumps of the queen algorithm (--output FILE). """
+import re
+import sys
+import argparse
+
+# number of solutions for the widths 1 to 27 (https://oeis.org/A000170)
+KNOWN_SOLUTIONS = {
+    1: 1, 2: 0, 3: 0, 4: 2, 5: 10, 6: 4, 7: 40, 8: 92, 9: 352, 10: 724,
+    11: 2680, 12: 14200, 13: 73712, 14: 365596, 15: 2279184, 16: 14772512,
+    17: 95815104, 18: 666090624, 19: 4968057848, 20: 39029188884,
+    21: 314666222712, 22: 2691008701644, 23: 24233937684440,
+    24: 227514171973736, 25: 2207893435808352, 26: 22317699616364044,
+    27: 234907967154122528
+}
+# number of solutions checked at once
+CHUNK_SIZE = 65536
+
+
+def check_count(width, solutions):
+    """True or False when the number of solutions is known for the width, otherwise None."""
+    if width not in KNOWN_SOLUTIONS:
+        return None
+    return KNOWN_SOLUTIONS[width] == solutions
+
+
+def read_binary(path, width, numpy):
+    """Chunks of solutions (one row per solution, the row of the queen per column)."""
+    with open(path, "rb") as handle:
+        while True:
+            buffer = handle.read(width * CHUNK_SIZE)
+            if not buffer:
+                break
+            if len(buffer) % width:
+                raise ValueError("%s: size is not a multiple of the width %d" % (path, width))
+            yield numpy.frombuffer(buffer, dtype=numpy.uint8).reshape(-1, width)
+
+
+def read_text(path, width, numpy):
+    """Chunks of solutions from lines of (column,row) pairs (1-based)."""
+    expression = re.compile(r"\((\d+),(\d+)\)")
+    with open(path) as handle:
+        lines = []
+        for line in handle:
+            if line.strip():
+                lines.append(line)
+            if len(lines) == CHUNK_SIZE:
+                yield parse_lines(expression, lines, width, numpy)
+                lines = []
+        if lines:
+            yield parse_lines(expression, lines, width, numpy)
+
+
+def parse_lines(expression, lines, width, numpy):
+    """Solutions of text lines; columns must be 1..width in order."""
+    pairs = numpy.array(expression.findall("".join(lines)), dtype=numpy.int64)
+    if len(pairs) != len(lines) * width:
+        raise ValueError("lines with other than %d queens found" % width)
+    pairs = pairs.reshape(len(lines), width, 2) - 1
+    if (pairs[:, :, 0] != numpy.arange(width)).any():
+        raise ValueError("lines with columns not in order found")
+    return pairs[:, :, 1]
+
+
+def distinct(values, numpy):
+    """Per solution whether all values of it are different."""
+    values = numpy.sort(values, axis=1)
+    return (values[:, 1:] != values[:, :-1]).all(axis=1)
+
+
+def validate(chunks, width, numpy):
+    """
+    Number of solutions, invalid solutions (queens in same row or diagonal,
+    rows outside of the board) and duplicate solutions of all chunks.
+    """
+    columns = numpy.arange(width, dtype=numpy.int64)
+    count, invalid, keys = 0, 0, []
+    for chunk in chunks:
+        rows = chunk.astype(numpy.int64)
+        valid = ((rows >= 0) & (rows < width)).all(axis=1)
+        valid &= distinct(rows, numpy) & distinct(rows + columns, numpy)
+        valid &= distinct(rows - columns, numpy)
+        count += len(rows)
+        invalid += int((~valid).sum())
+        # solutions as bytes of fixed size for finding duplicates
+        keys.append(numpy.ascontiguousarray(rows.astype(numpy.uint16))
+                    .view("V%d" % (2 * width)).ravel())
+
+    duplicates = 0
+    if keys:
+        duplicates = count - len(numpy.unique(numpy.concatenate(keys)))
+    return count, invalid, duplicates
+
+
+def get_width(path):
+    """Width of a text dump (number of queens of the first line)."""
+    with open(path) as handle:
+        for line in handle:
+            if line.strip():
+                return line.count("(")
+    return 0
+
+
+def main():
+    """Application entry point."""
+    parser = argparse.ArgumentParser(description="Validating a dump of queen solutions.")
+    parser.add_argument("dump", help="file written by --output FILE")
+    parser.add_argument("--binary", action="store_true",
+                        help="dump written with --binary (one byte per column)")
+    parser.add_argument("--width", type=int,
+                        help="width of the board (required for binary dumps)")
+    parser.add_argument("--partial", action="store_true",
+                        help="not comparing the number of solutions with the known one")
+    options = parser.parse_args()
+    try:
+        import numpy  # pylint: disable=C0415
+    except ImportError:
+        parser.error("validating requires the numpy package")
+
+    if options.binary and not options.width:
+        parser.error("--width is required for binary dumps")
+    width = options.width or get_width(options.dump)
+    reader = read_binary if options.binary else read_text
+
+    try:
+        count, invalid, duplicates = validate(reader(options.dump, width, numpy), width, numpy)
+    except ValueError as exception:
+        print("...%s" % exception)
+        return 1
+
+    print("...%d solutions checked for width %d." % (count, width))
+    print("...%d invalid, %d duplicates." % (invalid, duplicates))
+    failed = invalid > 0 or duplicates > 0
+    if not options.partial:
+        correct = check_count(width, count)
+        if correct is not None:
+            print("...expected %d solutions: %s." % (
+                KNOWN_SOLUTIONS[width], "ok" if correct else "WRONG"))
+            failed = failed or not correct
+    return 1 if failed else 0
+
+if __name__ == "__main__":
+    sys.exit(main())